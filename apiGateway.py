@@ -1,29 +1,56 @@
 import hashlib
-from fastapi import FastAPI, HTTPException, Depends, Path
+from fastapi import FastAPI, HTTPException, Depends, Path, Request
 from dotenv import load_dotenv
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, EmailStr
 from sqlalchemy import Enum, create_engine, Column, Integer, String, ForeignKey, func
 from sqlalchemy.orm import sessionmaker, declarative_base, Session, relationship, aliased
 from passlib.context import CryptContext
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, StreamingResponse, Response
 from typing import List, Optional
 from typing import List, Optional
-from gtts import gTTS
 import pandas as pd
+import numpy as np
 import io
 import os
+import gzip
 import random
 import json
 import re
-import torch
-from transformers import T5Tokenizer, T5ForConditionalGeneration
+import math
+import threading
+import bisect
+import itertools
+import queue
+import time
+import sqlite3
+import subprocess
+import wave
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 MODEL_PATH = "./translator_model_lite"
+ONNX_MODEL_PATH = "./translator_model_onnx"
 
 load_dotenv()
 
-app = FastAPI(title="Tutur API Gateway")
+@asynccontextmanager
+async def lifespan(app):
+
+    # model dimuat di background, jadi server langsung bisa menerima request
+    if TRANSLATOR_PRELOAD:
+        start_translator_loading()
+
+    yield
+
+app = FastAPI(title="Tutur API Gateway", lifespan=lifespan)
 
 origins = os.getenv("CORS_ORIGINS")
 
@@ -42,9 +69,33 @@ DATASET_PATH = os.path.join(
     "DatasetLanguage.xlsx"
 )
 COURSE_PATH = os.path.join("courses", "courses.json")
+COURSE_PAIRS_PATH = os.path.join("courses", "pairs")
 URBAN_LEGENDS_PATH = os.path.join("datasets", "urbanLegends")
 BASE_DATASET_PATH = os.path.join("datasets", "folkSongs")
 DATABASE_URL = os.getenv("DATABASE_URL")
+TRANSLATE_BATCH_WINDOW_MS = float(os.getenv("TRANSLATE_BATCH_WINDOW_MS", "10"))
+TRANSLATE_MAX_BATCH = int(os.getenv("TRANSLATE_MAX_BATCH", "16"))
+TRANSLATE_BULK_MAX_ITEMS = int(os.getenv("TRANSLATE_BULK_MAX_ITEMS", "5000"))
+TRANSLATION_CACHE_SIZE = int(os.getenv("TRANSLATION_CACHE_SIZE", "10000"))
+TRANSLATION_CACHE_TTL = float(os.getenv("TRANSLATION_CACHE_TTL", "0"))
+TRANSLATION_CACHE_DB = os.getenv("TRANSLATION_CACHE_DB", "")
+TRANSLATOR_BACKEND = os.getenv("TRANSLATOR_BACKEND", "torch")
+TRANSLATE_DECODING_PROFILE = os.getenv("TRANSLATE_DECODING_PROFILE", "beam4")
+TRANSLATE_MAX_NEW_TOKENS = int(os.getenv("TRANSLATE_MAX_NEW_TOKENS", "64"))
+TRANSLATE_LENGTH_RATIO = float(os.getenv("TRANSLATE_LENGTH_RATIO", "1.5"))
+TRANSLATE_LATENCY_BUDGET_MS = float(os.getenv("TRANSLATE_LATENCY_BUDGET_MS", "0"))
+TRANSLATOR_PRELOAD = os.getenv("TRANSLATOR_PRELOAD", "1") == "1"
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "1"))
+TORCH_INTRA_OP_THREADS = int(os.getenv("TORCH_INTRA_OP_THREADS", "0"))
+TRANSLATE_QUEUE_LIMIT = int(os.getenv("TRANSLATE_QUEUE_LIMIT", "64"))
+QUIZ_CACHE_SIZE = int(os.getenv("QUIZ_CACHE_SIZE", "5000"))
+TRANSLATOR_RETRY_AFTER = os.getenv("TRANSLATOR_RETRY_AFTER", "5")
+CONTENT_REFRESH_SECONDS = float(os.getenv("CONTENT_REFRESH_SECONDS", "5"))
+TTS_CACHE_SIZE = int(os.getenv("TTS_CACHE_SIZE", "500"))
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", os.path.join("cache", "tts"))
+TTS_CACHE_MAX_MB = float(os.getenv("TTS_CACHE_MAX_MB", "256"))
+TTS_BACKEND = os.getenv("TTS_BACKEND", "gtts")
+ESPEAK_PATH = os.getenv("ESPEAK_PATH", "espeak-ng")
 
 engine = create_engine(
     DATABASE_URL,
@@ -56,23 +107,203 @@ Base = declarative_base()
 
 pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
-if not os.path.exists(DATASET_PATH):
-    raise FileNotFoundError("DatasetLanguage.xlsx not found in datasets folder")
+# In-Memory Cache
 
-df = pd.read_excel(DATASET_PATH, keep_default_na=False)
-df["row_position"] = df.index + 2
+class LRUCache:
 
-if "english" not in df.columns:
-    raise Exception("Dataset must contain 'english' column")
+    def __init__(self, max_size, ttl=None):
+        self.max_size = max_size
+        self.ttl = ttl or None
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
 
-tokenizer = T5Tokenizer.from_pretrained(MODEL_PATH)
-model = T5ForConditionalGeneration.from_pretrained(MODEL_PATH)
+    def get(self, key):
 
-device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-model.to(device)
-model.eval()
+        with self.lock:
 
-LANGUAGE_MAP = {
+            entry = self.items.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self.items[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self.items.move_to_end(key)
+            self.hits += 1
+
+            return value
+
+    def set(self, key, value, ttl=None):
+
+        ttl = ttl or self.ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+
+        with self.lock:
+
+            self.items[key] = (value, expires_at)
+            self.items.move_to_end(key)
+
+            while len(self.items) > self.max_size:
+                self.items.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+
+        with self.lock:
+            self.items.clear()
+
+    def stats(self):
+
+        with self.lock:
+
+            lookups = self.hits + self.misses
+
+            return {
+                "size": len(self.items),
+                "maxSize": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hitRate": round(self.hits / lookups, 4) if lookups > 0 else 0
+            }
+
+# Folder Content Store
+
+class ContentStore:
+
+    def __init__(self, signature, build, refresh_seconds):
+        self.signature = signature
+        self.build = build
+        self.refresh_seconds = refresh_seconds
+        self.current = None
+        self.current_signature = None
+        self.checked_at = 0
+        self.lock = threading.Lock()
+
+    def get(self):
+
+        current = self.current
+
+        # dalam jeda refresh data dipakai tanpa menyentuh disk
+        if current is not None and time.monotonic() - self.checked_at < self.refresh_seconds:
+            return current
+
+        with self.lock:
+
+            if self.current is not None and time.monotonic() - self.checked_at < self.refresh_seconds:
+                return self.current
+
+            signature = self.signature()
+
+            if self.current is None or self.current_signature != signature:
+                self.current = self.build(signature)
+                self.current_signature = signature
+
+            self.checked_at = time.monotonic()
+
+            return self.current
+
+# Dataset Store
+
+def normalize_lookup_text(text):
+    text = re.sub(r"[^\w\s]", "", str(text).lower())
+    return " ".join(text.split())
+
+def load_dataset_store():
+
+    if not os.path.exists(DATASET_PATH):
+        raise FileNotFoundError("DatasetLanguage.xlsx not found in datasets folder")
+
+    # "nan" adalah kata Minang, jangan dibaca sebagai sel kosong
+    frame = pd.read_excel(DATASET_PATH, engine="openpyxl", keep_default_na=False)
+    frame.columns = frame.columns.str.lower()
+    frame["row_position"] = frame.index + 2
+
+    if "english" not in frame.columns:
+        raise Exception("Dataset must contain 'english' column")
+
+    if "type" not in frame.columns:
+        raise Exception("Dataset must contain 'type' column")
+
+    with open(DATASET_PATH, "rb") as f:
+        content_hash = hashlib.sha256(f.read()).hexdigest()
+
+    # kolom bahasa selalu berada sebelum kolom "type"
+    language_columns = list(frame.columns[:frame.columns.get_loc("type")])
+
+    columns = {}
+    lower = {}
+
+    for col in language_columns + ["type", "category_topic"]:
+
+        if col not in frame.columns:
+            continue
+
+        values = np.array(
+            ["" if pd.isna(value) else str(value) for value in frame[col]],
+            dtype=object
+        )
+
+        columns[col] = values
+        lower[col] = np.array([value.lower() for value in values], dtype=object)
+
+    # index hash per kolom sumber: teks ternormalisasi -> baris pertama
+    lookup = {}
+
+    for col in language_columns:
+
+        index = {}
+
+        for row, value in enumerate(columns[col]):
+
+            key = normalize_lookup_text(value)
+
+            if key and key not in index:
+                index[key] = row
+
+        lookup[col] = index
+
+    return {
+        "frame": frame,
+        "hash": content_hash,
+        "size": len(frame),
+        "language_columns": language_columns,
+        "columns": columns,
+        "lower": lower,
+        "lookup": lookup,
+        "row_position": frame["row_position"].to_numpy(dtype=np.int32)
+    }
+
+dataset_lock = threading.RLock()
+dictionary_payloads = {}
+dictionary_indexes = {}
+dataset_store = load_dataset_store()
+
+def reload_dataset_store():
+    global dataset_store
+
+    with dataset_lock:
+        dataset_store = load_dataset_store()
+        dictionary_payloads.clear()
+        dictionary_indexes.clear()
+
+    return dataset_store
+
+# kode bahasa gTTS; iban dan melayu_serawak belum punya suara sendiri jadi memakai melayu
+TTS_VOICES = {
     "indonesia": "id",
     "english": "en",
     "malay": "ms",
@@ -80,9 +311,27 @@ LANGUAGE_MAP = {
     "melayu_serawak" : "ms",
 }
 
+# suara per backend TTS; bahasa yang tidak dikenal memakai suara "indonesia"
+LANGUAGE_MAP = {
+    "gtts": TTS_VOICES,
+    # id voice espeak-ng (espeak-ng --voices)
+    "espeak": {
+        **TTS_VOICES,
+        "english": "en-us",
+    },
+    # stub tidak punya suara; nama bahasa cukup supaya tiap bahasa punya nada berbeda
+    "stub": {language: language for language in TTS_VOICES},
+}
+
 class TranslateRequest(BaseModel):
     text: str
     target_language: str
+    source_language: str = "english"
+    decoding_profile: Optional[str] = None
+    latency_budget_ms: Optional[float] = None
+
+class BatchTranslateRequest(BaseModel):
+    items: List[TranslateRequest]
 
 class User(Base):
     __tablename__ = "users"
@@ -172,66 +421,333 @@ def get_db():
     finally:
         db.close()
 
-df = pd.read_excel(DATASET_PATH)
-df["row_position"] = df.index + 2
-
 # Dictionary Endpoints
 
+def build_dictionary_payload(store, dominant_col, local_col):
+
+    dominant_values = store["columns"][dominant_col]
+    local_values = store["columns"][local_col]
+
+    word_rows = np.flatnonzero(
+        (store["lower"]["type"] == "word") & (dominant_values != "")
+    )
+    word_rows = sorted(word_rows, key=lambda i: dominant_values[i])
+
+    words = [
+        {
+            dominant_col: dominant_values[i],
+            local_col: local_values[i] if local_values[i] != "" else None
+        }
+        for i in word_rows
+    ]
+
+    body = json.dumps(
+        {
+            "dominant_language": dominant_col,
+            "local_language": local_col,
+            "total": len(words),
+            "words": words
+        },
+        ensure_ascii=False,
+        separators=(",", ":")
+    ).encode("utf-8")
+
+    etag = hashlib.sha256(
+        f"{store['hash']}:{dominant_col}:{local_col}".encode()
+    ).hexdigest()[:32]
+
+    return build_json_payload(body, etag)
+
+def build_json_payload(body, etag):
+
+    payload = {
+        "etag": f'"{etag}"',
+        "identity": body,
+        "gzip": gzip.compress(body)
+    }
+
+    if brotli is not None:
+        payload["br"] = brotli.compress(body)
+
+    return payload
+
+def get_dictionary_payload(dominant_col, local_col):
+
+    store = dataset_store
+    key = (store["hash"], dominant_col, local_col)
+
+    payload = dictionary_payloads.get(key)
+
+    if payload is None:
+        payload = build_dictionary_payload(store, dominant_col, local_col)
+        dictionary_payloads[key] = payload
+
+    return payload
+
+def etag_matches(if_none_match, etag):
+
+    if not if_none_match:
+        return False
+
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+
+    return "*" in tags or etag in tags
+
+def pick_encoding(accept_encoding, payload):
+
+    accepted = [
+        part.split(";")[0].strip()
+        for part in (accept_encoding or "").lower().split(",")
+    ]
+
+    if "br" in payload and "br" in accepted:
+        return "br"
+
+    if "gzip" in accepted:
+        return "gzip"
+
+    return "identity"
+
+def json_payload_response(request, payload):
+
+    headers = {
+        "ETag": payload["etag"],
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding"
+    }
+
+    if etag_matches(request.headers.get("if-none-match"), payload["etag"]):
+        return Response(status_code=304, headers=headers)
+
+    encoding = pick_encoding(request.headers.get("accept-encoding"), payload)
+
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+
+    return Response(
+        content=payload[encoding],
+        media_type="application/json",
+        headers=headers
+    )
+
 @app.get("/api/tutur/dic/{dominant}/{local}")
-def get_dictionary(dominant: str, local: str):
+def get_dictionary(dominant: str, local: str, request: Request):
 
-    if not os.path.exists(DATASET_PATH):
-        raise HTTPException(status_code=404, detail="Dataset file not found")
+    store = dataset_store
 
     try:
-        df = pd.read_excel(DATASET_PATH, engine="openpyxl")
-        df.columns = df.columns.str.lower()
-
         dominant_col = dominant.lower()
         local_col = local.lower()
 
-        if dominant_col not in df.columns:
+        if dominant_col not in store["language_columns"]:
             raise HTTPException(
                 status_code=400,
                 detail=f"Column '{dominant}' not found in dataset"
             )
 
-        if local_col not in df.columns:
+        if local_col not in store["language_columns"]:
             raise HTTPException(
                 status_code=400,
                 detail=f"Column '{local}' not found in dataset"
             )
 
-        if "type" not in df.columns:
-            raise HTTPException(
-                status_code=400,
-                detail="Column 'type' not found in dataset"
-            )
-
-        filtered_df = df[df["type"].str.lower() == "word"]
-        filtered_df = filtered_df[[dominant_col, local_col]].dropna(subset=[dominant_col])
-        filtered_df = filtered_df.sort_values(by=dominant_col)
+        payload = get_dictionary_payload(dominant_col, local_col)
 
-        words = [
-            {
-                dominant_col: str(row[dominant_col]),
-                local_col: str(row[local_col]) if pd.notna(row[local_col]) else None
-            }
-            for _, row in filtered_df.iterrows()
-        ]
-
-        return JSONResponse(
-            content={
-                "dominant_language": dominant_col,
-                "local_language": local_col,
-                "total": len(words),
-                "words": words
-            }
-        )
+        return json_payload_response(request, payload)
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+DICTIONARY_SEARCH_MAX_LIMIT = 100
+
+def build_dictionary_index(store, dominant_col, local_col, field_col):
+
+    lowered = store["lower"][field_col]
+
+    word_rows = np.flatnonzero(
+        (store["lower"]["type"] == "word")
+        & (store["columns"][dominant_col] != "")
+        & (lowered != "")
+    )
+
+    entries = sorted((lowered[i], int(i)) for i in word_rows)
+
+    suffixes = sorted(
+        (lowered[i][start:], int(i))
+        for i in word_rows
+        for start in range(len(lowered[i]))
+    )
+
+    # posisi suffix sebelumnya dari baris yang sama; suffix p adalah kemunculan
+    # pertama barisnya di rentang [lo, hi) jika previous[p] < lo
+    previous = np.full(len(suffixes), -1, dtype=np.int64)
+    last_seen = {}
+
+    for position, (_, row) in enumerate(suffixes):
+        previous[position] = last_seen.get(row, -1)
+        last_seen[row] = position
+
+    return {
+        "keys": [key for key, _ in entries],
+        "rows": [row for _, row in entries],
+        "suffix_keys": [key for key, _ in suffixes],
+        "suffix_rows": [row for _, row in suffixes],
+        "suffix_previous": previous,
+        "suffix_count_tree": build_count_tree(previous)
+    }
+
+def build_count_tree(values):
+
+    # merge sort tree: level j berisi blok berukuran 2^j yang sudah diurutkan
+    size = 1
+    while size < len(values):
+        size *= 2
+
+    level = np.full(size, np.iinfo(np.int64).max, dtype=np.int64)
+    level[:len(values)] = values
+
+    levels = [level]
+    width = 1
+
+    while width < size:
+        width *= 2
+        level = np.sort(level.reshape(-1, width), axis=1).ravel()
+        levels.append(level)
+
+    return levels
+
+def count_less_than(levels, lo, hi, bound):
+
+    # jumlah nilai < bound di [lo, hi) dalam O(log^2 n)
+    count = 0
+    depth = 0
+
+    while lo < hi:
+
+        if lo & 1:
+            block = levels[depth][lo << depth:(lo + 1) << depth]
+            count += int(np.searchsorted(block, bound))
+            lo += 1
+
+        if hi & 1:
+            hi -= 1
+            block = levels[depth][hi << depth:(hi + 1) << depth]
+            count += int(np.searchsorted(block, bound))
+
+        lo >>= 1
+        hi >>= 1
+        depth += 1
+
+    return count
+
+def get_dictionary_index(dominant_col, local_col, field_col):
+
+    store = dataset_store
+    key = (store["hash"], dominant_col, local_col, field_col)
+
+    index = dictionary_indexes.get(key)
+
+    if index is None:
+        index = build_dictionary_index(store, dominant_col, local_col, field_col)
+        dictionary_indexes[key] = index
+
+    return store, index
+
+def prefix_range(keys, prefix):
+
+    lo = bisect.bisect_left(keys, prefix)
+    hi = bisect.bisect_left(keys, prefix + chr(0x10FFFF), lo)
+
+    return lo, hi
+
+@app.get("/api/tutur/dic/search/{dominant}/{local}")
+def search_dictionary(
+    dominant: str,
+    local: str,
+    q: str = "",
+    field: str = "dominant",
+    mode: str = "prefix",
+    cursor: int = 0,
+    limit: int = 20
+):
+
+    dominant_col = dominant.lower()
+    local_col = local.lower()
+
+    if dominant_col not in dataset_store["language_columns"]:
+        raise HTTPException(status_code=400, detail=f"Column '{dominant}' not found in dataset")
+
+    if local_col not in dataset_store["language_columns"]:
+        raise HTTPException(status_code=400, detail=f"Column '{local}' not found in dataset")
+
+    if field not in ["dominant", "local"]:
+        raise HTTPException(status_code=400, detail="field must be 'dominant' or 'local'")
+
+    if mode not in ["prefix", "substring"]:
+        raise HTTPException(status_code=400, detail="mode must be 'prefix' or 'substring'")
+
+    if cursor < 0 or limit < 1:
+        raise HTTPException(status_code=400, detail="Invalid cursor or limit")
+
+    limit = min(limit, DICTIONARY_SEARCH_MAX_LIMIT)
+    field_col = dominant_col if field == "dominant" else local_col
+    query = q.strip().lower()
+
+    store, index = get_dictionary_index(dominant_col, local_col, field_col)
+
+    if mode == "prefix" or not query:
+        lo, hi = prefix_range(index["keys"], query)
+
+        start = min(lo + cursor, hi)
+        end = min(start + limit, hi)
+
+        page_rows = index["rows"][start:end]
+        total = hi - lo
+        next_cursor = end - lo if end < hi else None
+    else:
+        # urutan hasil mengikuti suffix array; cursor adalah posisi di rentang suffix
+        lo, hi = prefix_range(index["suffix_keys"], query)
+        previous = index["suffix_previous"]
+
+        position = min(lo + cursor, hi)
+        page_rows = []
+
+        while position < hi and len(page_rows) < limit:
+            if previous[position] < lo:
+                page_rows.append(index["suffix_rows"][position])
+            position += 1
+
+        while position < hi and previous[position] >= lo:
+            position += 1
+
+        total = count_less_than(index["suffix_count_tree"], lo, hi, lo)
+        next_cursor = position - lo if position < hi else None
+
+    dominant_values = store["columns"][dominant_col]
+    local_values = store["columns"][local_col]
+
+    words = [
+        {
+            dominant_col: dominant_values[i],
+            local_col: local_values[i] if local_values[i] != "" else None
+        }
+        for i in page_rows
+    ]
+
+    return {
+        "dominant_language": dominant_col,
+        "local_language": local_col,
+        "field": field,
+        "mode": mode,
+        "query": query,
+        "total": total,
+        "cursor": cursor,
+        "next_cursor": next_cursor,
+        "words": words
+    }
+
 # User Management Endpoints
 
 @app.post("/api/tutur/users")
@@ -617,657 +1133,1711 @@ def delete_language(idLanguage: int, db: Session = Depends(get_db)):
 
 # Courses Management Endpoints
 
-def generate_word_questions(words_df, dominant, local):
+def build_option_pool(values):
 
-    questions = []
+    unique = [value for value in dict.fromkeys(values) if value != ""]
 
-    for _, row in words_df.iterrows():
+    return {
+        "values": np.array(unique, dtype=object),
+        "positions": {value: i for i, value in enumerate(unique)}
+    }
 
-        direction = random.choice(["dominant", "local"])
+def sample_distractors(pool, exclude, k, rng):
 
-        if direction == "dominant":
-            question_text = row[dominant]
-            correct_answer = row[local]
-            option_pool = words_df[local].tolist()
-        else:
-            question_text = row[local]
-            correct_answer = row[dominant]
-            option_pool = words_df[dominant].tolist()
+    total = len(pool["values"])
+    excluded = pool["positions"].get(exclude)
 
-        distractors = [w for w in option_pool if w != correct_answer]
-        random.shuffle(distractors)
+    available = total - 1 if excluded is not None else total
+    k = min(k, available)
 
-        options = distractors[:4] + [correct_answer]
-        options = list(set(options))
-        random.shuffle(options)
+    if k <= 0:
+        return []
 
-        questions.append({
-            "question": question_text,
-            "options": options,
-            "answer": correct_answer,
-            "type": direction
-        })
+    # ambil k indeks unik tanpa menyalin atau mengacak seluruh pool
+    picked = rng.choice(available, size=k, replace=False)
 
-    random.shuffle(questions)
-    return questions[:10]
+    if excluded is not None:
+        picked = picked + (picked >= excluded)
 
-def generate_phrase_questions(phrase_df, word_df, dominant, local):
+    return pool["values"][picked].tolist()
 
-    questions = []
+def build_options(pool, correct_answer, rng):
 
-    phrase_list = phrase_df.to_dict("records")
-    word_list = word_df.to_dict("records")
+    options = sample_distractors(pool, correct_answer, 4, rng) + [correct_answer]
+    rng.shuffle(options)
 
-    while len(questions) < 10:
+    return options
 
-        row = random.choice(phrase_list)
-        question_type = random.choice(["dominant", "local", "blank"])
+def build_step_index(courses):
 
-        if question_type == "dominant":
+    items = {}
+
+    for topic in courses.values():
+        for item in topic:
+            items.setdefault(item["step"], item)
 
-            question_text = row[dominant]
-            correct_answer = row[local]
+    links = {}
 
-            option_pool = [p[local] for p in phrase_list]
+    for step, item in items.items():
 
-        elif question_type == "local":
+        if "listPhrases" in item:
+            word_step = items.get(step - 1)
+            links[step] = {
+                "word": step - 1 if word_step and "listWords" in word_step else None,
+                "phrase": None
+            }
 
-            question_text = row[local]
-            correct_answer = row[dominant]
+        elif "listSentences" in item:
+            word_step = items.get(step - 2)
+            phrase_step = items.get(step - 1)
+            links[step] = {
+                "word": step - 2 if word_step and "listWords" in word_step else None,
+                "phrase": step - 1 if phrase_step and "listPhrases" in phrase_step else None
+            }
 
-            option_pool = [p[dominant] for p in phrase_list]
+    return {"items": items, "links": links}
 
-        else:
+def compile_course_bank(courses, store, signature):
 
-            local_phrase = row[local]
-            words = local_phrase.split()
+    step_index = build_step_index(courses)
+    row_index = {int(position): i for i, position in enumerate(store["row_position"])}
+    language_columns = store["language_columns"]
 
-            if len(words) < 2:
-                continue
+    def compile_rows(rows):
 
-            removed_word = random.choice(words)
-            blank_phrase = local_phrase.replace(removed_word, "____", 1)
+        # urutan baris mengikuti dataset, sama seperti df.isin
+        indexes = sorted(row_index[row] for row in set(rows) if row in row_index)
 
-            option_pool = [w[local] for w in word_list]
+        values = {
+            col: [store["columns"][col][i] for i in indexes]
+            for col in language_columns
+        }
 
-            distractors = [w for w in option_pool if w != removed_word]
-            random.shuffle(distractors)
+        return {
+            "values": values,
+            "pools": {col: build_option_pool(values[col]) for col in language_columns}
+        }
 
-            options = distractors[:4] + [removed_word]
-            options = list(set(options))
-            random.shuffle(options)
+    def compile_linked_words(step):
 
-            questions.append({
-                "question": blank_phrase,
-                "options": options,
-                "answer": removed_word,
-                "type": "blank"
-            })
+        word_step = step_index["links"][step]["word"]
+
+        if word_step is None:
+            return None
+
+        words = compile_rows(step_index["items"][word_step]["listWords"])
+
+        # step kata tanpa baris tidak bisa dipakai sebagai pilihan jawaban
+        if not words["values"][language_columns[0]]:
+            return None
+
+        return words
 
+    steps = {}
+
+    for step, item in step_index["items"].items():
+
+        # step tanpa baris yang cocok di dataset dilewati, bukan dikirim sebagai soal kosong
+        list_key = next((key for key in ("listWords", "listPhrases", "listSentences") if key in item), None)
+
+        if list_key is None or not any(row in row_index for row in item[list_key]):
             continue
 
-        distractors = [x for x in option_pool if x != correct_answer]
-        random.shuffle(distractors)
+        if "listWords" in item:
 
-        options = distractors[:4] + [correct_answer]
-        options = list(set(options))
-        random.shuffle(options)
+            steps[step] = {
+                "step": step,
+                "type": "word",
+                "words": compile_rows(item["listWords"])
+            }
 
-        questions.append({
-            "question": question_text,
-            "options": options,
-            "answer": correct_answer,
-            "type": question_type
-        })
+        elif "listPhrases" in item:
 
-    return questions
+            steps[step] = {
+                "step": step,
+                "type": "phrase",
+                "phrases": compile_rows(item["listPhrases"]),
+                "words": compile_linked_words(step)
+            }
 
-def generate_sentence_questions(sentence_df, word_df, dominant, local):
+        elif "listSentences" in item:
 
-    questions = []
+            steps[step] = {
+                "step": step,
+                "type": "sentence",
+                "sentences": compile_rows(item["listSentences"]),
+                "words": compile_linked_words(step)
+            }
 
-    sentence_list = sentence_df.to_dict("records")
-    word_list = word_df.to_dict("records")
+    return {
+        "signature": signature,
+        "language_columns": language_columns,
+        "index": step_index,
+        "steps": steps,
+        "order": sorted(steps)
+    }
 
-    while len(questions) < 10:
+course_bank_lock = threading.Lock()
+course_banks = {}
 
-        row = random.choice(sentence_list)
-        question_type = random.choice(["dominant", "local", "blank"])
+def course_plan_path(dominant, local, store):
 
-        if question_type == "dominant":
+    # rencana khusus pasangan bahasa dari courseGenerator, jika ada
+    if dominant in store["language_columns"] and local in store["language_columns"]:
+        pair_path = os.path.join(COURSE_PAIRS_PATH, f"{dominant}__{local}.json")
 
-            question_text = row[dominant]
-            correct_answer = row[local]
+        if os.path.exists(pair_path):
+            return pair_path
 
-            option_pool = [s[local] for s in sentence_list]
+    return COURSE_PATH
 
-        elif question_type == "local":
+def course_bank_signature(path, store):
 
-            question_text = row[local]
-            correct_answer = row[dominant]
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Course file not found")
 
-            option_pool = [s[dominant] for s in sentence_list]
+    # dibangun ulang jika file kursus atau dataset berubah
+    return (path, stat.st_mtime_ns, stat.st_size, store["hash"])
 
-        else:
+def get_course_bank(dominant=None, local=None):
 
-            local_sentence = row[local]
-            words = local_sentence.split()
+    store = dataset_store
+    path = course_plan_path(dominant, local, store)
+    signature = course_bank_signature(path, store)
+    bank = course_banks.get(path)
 
-            if len(words) < 3:
-                continue
+    if bank is not None and bank["signature"] == signature:
+        return bank
 
-            removed_word = random.choice(words)
-            blank_sentence = local_sentence.replace(removed_word, "____", 1)
+    with course_bank_lock:
 
-            option_pool = [w[local] for w in word_list]
+        bank = course_banks.get(path)
 
-            distractors = [w for w in option_pool if w != removed_word]
-            random.shuffle(distractors)
+        if bank is not None and bank["signature"] == signature:
+            return bank
 
-            options = distractors[:4] + [removed_word]
-            options = list(set(options))
-            random.shuffle(options)
+        with open(path, "r", encoding="utf-8") as f:
+            courses = json.load(f)
 
-            questions.append({
-                "question": blank_sentence,
-                "options": options,
-                "answer": removed_word,
-                "type": "blank"
-            })
+        bank = compile_course_bank(courses, store, signature)
+        course_banks[path] = bank
 
-            continue
+        return bank
+
+def warm_course_banks():
+
+    if os.path.exists(COURSE_PATH):
+        get_course_bank()
+
+    if not os.path.isdir(COURSE_PAIRS_PATH):
+        return
+
+    language_columns = dataset_store["language_columns"]
+
+    for dominant in language_columns:
+        for local in language_columns:
+            if os.path.exists(os.path.join(COURSE_PAIRS_PATH, f"{dominant}__{local}.json")):
+                get_course_bank(dominant, local)
+
+warm_course_banks()
+
+QUESTION_DIRECTIONS = ["dominant", "local"]
+QUESTION_TYPES = ["dominant", "local", "blank"]
 
-        distractors = [x for x in option_pool if x != correct_answer]
-        random.shuffle(distractors)
+def generate_word_questions(words, dominant, local, rng):
 
-        options = distractors[:4] + [correct_answer]
-        options = list(set(options))
-        random.shuffle(options)
+    questions = []
+
+    values = words["values"]
+
+    # hanya 10 soal yang dipakai, jadi pilih barisnya dulu
+    for i in rng.permutation(len(values[dominant]))[:10]:
+
+        direction = QUESTION_DIRECTIONS[rng.integers(2)]
+
+        if direction == "dominant":
+            question_text = values[dominant][i]
+            correct_answer = values[local][i]
+            option_pool = words["pools"][local]
+        else:
+            question_text = values[local][i]
+            correct_answer = values[dominant][i]
+            option_pool = words["pools"][dominant]
 
         questions.append({
             "question": question_text,
-            "options": options,
+            "options": build_options(option_pool, correct_answer, rng),
             "answer": correct_answer,
-            "type": question_type
+            "type": direction
         })
 
     return questions
 
-def find_step(courses, step):
+def generate_blank_question(text, words, local, min_words, rng):
 
-    for topic in courses.values():
-        for item in topic:
-            if item["step"] == step:
-                return item
+    text_words = text.split()
 
-    return None
+    if len(text_words) < min_words:
+        return None
 
-@app.get("/api/tutur/course/{dominant}/{local}")
-def get_all_course(dominant: str, local: str):
+    removed_word = text_words[rng.integers(len(text_words))]
 
-    try:
-        if dominant not in df.columns or local not in df.columns:
-            raise HTTPException(status_code=400, detail="Language column not found")
+    return {
+        "question": text.replace(removed_word, "____", 1),
+        "options": build_options(words["pools"][local], removed_word, rng),
+        "answer": removed_word,
+        "type": "blank"
+    }
 
-        if not os.path.exists(COURSE_PATH):
-            raise HTTPException(status_code=404, detail="Course file not found")
+def generate_translation_questions(items, words, dominant, local, min_words, rng):
 
-        with open(COURSE_PATH, "r", encoding="utf-8") as f:
-            courses = json.load(f)
+    questions = []
 
-        result = []
+    values = items["values"]
+    total_items = len(values[dominant])
+
+    while len(questions) < 10:
+
+        i = rng.integers(total_items)
+        question_type = QUESTION_TYPES[rng.integers(3)]
+
+        if question_type == "blank":
+
+            question = generate_blank_question(values[local][i], words, local, min_words, rng)
+
+            if question:
+                questions.append(question)
+
+            continue
+
+        if question_type == "dominant":
+            question_text = values[dominant][i]
+            correct_answer = values[local][i]
+            option_pool = items["pools"][local]
+        else:
+            question_text = values[local][i]
+            correct_answer = values[dominant][i]
+            option_pool = items["pools"][dominant]
+
+        questions.append({
+            "question": question_text,
+            "options": build_options(option_pool, correct_answer, rng),
+            "answer": correct_answer,
+            "type": question_type
+        })
+
+    return questions
+
+def generate_phrase_questions(phrases, words, dominant, local, rng):
+    return generate_translation_questions(phrases, words, dominant, local, 2, rng)
+
+def generate_sentence_questions(sentences, words, dominant, local, rng):
+    return generate_translation_questions(sentences, words, dominant, local, 3, rng)
+
+def derive_seed(*parts):
+    digest = hashlib.sha256(":".join(str(part) for part in parts).encode()).digest()
+    return int.from_bytes(digest[:8], "big")
+
+def resolve_quiz_seed(step, seed, idUser, attempt):
+
+    if seed is not None:
+        return derive_seed(seed, step)
+
+    if idUser is not None:
+        return derive_seed(idUser, step, attempt)
+
+    return None
+
+quiz_cache = LRUCache(QUIZ_CACHE_SIZE)
+
+def get_step_questions(bank, entry, dominant, local, seed):
+
+    # tanpa seed kuis selalu acak sehingga tidak perlu disimpan
+    if seed is None:
+        return generate_step_questions(entry, dominant, local)
+
+    cache_key = (bank["signature"], entry["step"], dominant, local, seed)
+    questions = quiz_cache.get(cache_key)
+
+    if questions is None:
+        questions = generate_step_questions(entry, dominant, local, seed)
+        quiz_cache.set(cache_key, questions)
+
+    return questions
+
+def generate_step_questions(entry, dominant, local, seed=None):
+
+    rng = np.random.default_rng(seed)
+
+    if entry["type"] == "word":
+        return generate_word_questions(entry["words"], dominant, local, rng)
+
+    if entry["type"] == "phrase":
+        return generate_phrase_questions(entry["phrases"], entry["words"], dominant, local, rng)
+
+    return generate_sentence_questions(entry["sentences"], entry["words"], dominant, local, rng)
+
+def stream_course_steps(bank, dominant, local, seed, idUser, attempt):
+
+    for step in bank["order"]:
+
+        entry = bank["steps"][step]
+
+        if entry["type"] != "word" and entry["words"] is None:
+            continue
+
+        step_seed = resolve_quiz_seed(step, seed, idUser, attempt)
+
+        yield ndjson_line({
+            "step": step,
+            "questions": get_step_questions(bank, entry, dominant, local, step_seed)
+        })
+
+@app.get("/api/tutur/course/{dominant}/{local}")
+def get_all_course(
+    dominant: str,
+    local: str,
+    seed: Optional[int] = None,
+    idUser: Optional[int] = None,
+    attempt: int = 0,
+    stream: bool = False
+):
+
+    try:
+        if dominant not in dataset_store["language_columns"] or local not in dataset_store["language_columns"]:
+            raise HTTPException(status_code=400, detail="Language column not found")
+
+        bank = get_course_bank(dominant, local)
+
+        if stream:
+            return StreamingResponse(
+                stream_course_steps(bank, dominant, local, seed, idUser, attempt),
+                media_type="application/x-ndjson"
+            )
+
+        result = []
+
+        for step in bank["order"]:
+
+            entry = bank["steps"][step]
+
+            if entry["type"] != "word" and entry["words"] is None:
+                continue
+
+            step_seed = resolve_quiz_seed(step, seed, idUser, attempt)
+
+            result.append({
+                "step": step,
+                "questions": get_step_questions(bank, entry, dominant, local, step_seed)
+            })
+
+        return {
+            "total_step": len(result),
+            "total_questions": sum(len(item["questions"]) for item in result),
+            "courses": result
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/tutur/course/{step}/{dominant}/{local}")
+def get_course_by_step(
+    step: int,
+    dominant: str,
+    local: str,
+    seed: Optional[int] = None,
+    idUser: Optional[int] = None,
+    attempt: int = 0
+):
+
+    if dominant not in dataset_store["language_columns"] or local not in dataset_store["language_columns"]:
+        raise HTTPException(status_code=400, detail="Language column not found")
+
+    bank = get_course_bank(dominant, local)
+
+    entry = bank["steps"].get(step)
+
+    if not entry:
+        raise HTTPException(status_code=404, detail="Step not found")
+
+    if entry["type"] != "word" and entry["words"] is None:
+        raise HTTPException(status_code=404, detail="Word step for this step not found")
+
+    step_seed = resolve_quiz_seed(step, seed, idUser, attempt)
+    questions = get_step_questions(bank, entry, dominant, local, step_seed)
+
+    return {"questions": questions}
+
+# Urban Legends Endpoint
+
+def urban_legends_signature():
+
+    if not os.path.isdir(URBAN_LEGENDS_PATH):
+        raise HTTPException(status_code=404, detail="urbanLegends folder not found")
+
+    entries = []
+
+    with os.scandir(URBAN_LEGENDS_PATH) as it:
+        for entry in it:
+            if entry.name.endswith(".json") and entry.is_file():
+                stat = entry.stat()
+                entries.append((entry.name, stat.st_mtime_ns, stat.st_size))
+
+    # file ditambah, dihapus, atau diubah -> signature berubah
+    return tuple(sorted(entries))
+
+def build_urban_legend_store(signature):
+
+    languages = {}
+    all_data = {}
+
+    for filename, _, _ in signature:
+
+        with open(os.path.join(URBAN_LEGENDS_PATH, filename), "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        languages[os.path.splitext(filename)[0]] = data
+        all_data.update(data)
+
+    def payload(data):
+        body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return build_json_payload(body, hashlib.sha256(body).hexdigest()[:32])
+
+    return {
+        "languages": languages,
+        "stories": {
+            lang: {title: build_story_index(story) for title, story in data.items()}
+            for lang, data in languages.items()
+        },
+        "payloads": {lang: payload(data) for lang, data in languages.items()},
+        "all_payload": payload(all_data)
+    }
+
+STORY_TOKEN_PATTERN = re.compile(r"\S+")
+STORY_CORE_PATTERN = re.compile(r"\w(?:.*\w)?")
+
+def build_story_index(story_data):
+
+    sentences = []
+    vocabulary = set()
+
+    for sentence in story_data.get("story", []):
+
+        spans = []
+        words = []
+
+        for token in STORY_TOKEN_PATTERN.finditer(sentence):
+
+            core = STORY_CORE_PATTERN.search(token.group())
+
+            if core is None:
+                continue
+
+            # tanda baca di awal/akhir token tetap tampil di soal; kata ulang
+            # seperti "candhi-candhi" tetap utuh sehingga jawaban sama dengan yang dikosongkan
+            word = core.group()
+
+            spans.append((token.start() + core.start(), token.start() + core.end()))
+            words.append(word)
+            vocabulary.add(word.lower())
+
+        sentences.append({
+            "text": sentence,
+            "spans": spans,
+            "words": words
+        })
+
+    return {
+        "sentences": sentences,
+        "vocabulary": sorted(vocabulary)
+    }
+
+urban_legend_store = ContentStore(urban_legends_signature, build_urban_legend_store, CONTENT_REFRESH_SECONDS)
+
+def get_urban_legend_store():
+    return urban_legend_store.get()
+
+@app.get("/api/tutur/urban-legends")
+def get_all_urban_legends(request: Request):
+
+    store = get_urban_legend_store()
+
+    return json_payload_response(request, store["all_payload"])
+
+@app.get("/api/tutur/urban-legends/{lang}")
+def get_urban_legend_by_lang(lang: str, request: Request):
+
+    store = get_urban_legend_store()
+
+    if lang not in store["payloads"]:
+        raise HTTPException(status_code=404, detail="Language file not found")
+
+    return json_payload_response(request, store["payloads"][lang])
+
+@app.get("/api/tutur/urban-legends/test/{lang}/{title}")
+def generate_urban_legend_test(lang: str, title: str, seed: Optional[int] = None):
+
+    if not lang.isalpha():
+        raise HTTPException(status_code=400, detail="Invalid language parameter")
+
+    store = get_urban_legend_store()
+
+    if lang not in store["languages"]:
+        raise HTTPException(status_code=404, detail="Language file not found")
+
+    data = store["languages"][lang]
+
+    if title not in data:
+        raise HTTPException(status_code=404, detail="Story title not found")
+
+    story_data = data[title]
+    story_index = store["stories"][lang][title]
+
+    if not story_index["sentences"]:
+        raise HTTPException(status_code=404, detail="Story content empty")
+
+    vocabulary = story_index["vocabulary"]
+
+    rng = random.Random(derive_seed(lang, title, seed) if seed is not None else None)
+
+    questions = []
+
+    for sentence in story_index["sentences"]:
+
+        words = sentence["words"]
+
+        if len(words) < 3:
+            continue
+
+        blank_count = rng.randint(1, min(3, len(words)))
+        blank_indexes = sorted(rng.sample(range(len(words)), blank_count))
+
+        removed_words = [words[i] for i in blank_indexes]
+
+        # kosongkan berdasarkan posisi token, bukan str.replace
+        text = sentence["text"]
+        parts = []
+        cursor = 0
+
+        for i in blank_indexes:
+            start, end = sentence["spans"][i]
+            parts.append(text[cursor:start])
+            parts.append("____")
+            cursor = end
+
+        parts.append(text[cursor:])
+        blank_sentence = "".join(parts)
+
+        removed_lower = {word.lower() for word in removed_words}
+        distractor_count = 5 - len(removed_words)
+
+        candidates = rng.sample(range(len(vocabulary)), min(len(vocabulary), distractor_count + len(removed_lower)))
+        distractors = [vocabulary[i] for i in candidates if vocabulary[i] not in removed_lower]
+
+        options = distractors[:distractor_count]
+        options.extend(removed_words)
+
+        options = list(dict.fromkeys(options))
+        rng.shuffle(options)
+
+        questions.append({
+            "question": blank_sentence,
+            "options": options,
+            "answer": removed_words
+        })
+
+    return {
+        "title": story_data.get("title"),
+        "lang": story_data.get("lang"),
+        "questions": questions
+    }
+
+# Folk Song Endpoint
+
+def folk_songs_signature():
+
+    if not os.path.isdir(BASE_DATASET_PATH):
+        raise HTTPException(status_code=404, detail="Dataset folder not found")
+
+    entries = []
+
+    with os.scandir(BASE_DATASET_PATH) as folders:
+        for folder in folders:
+
+            if not folder.is_dir():
+                continue
+
+            entries.append((folder.name, None, 0, 0))
+
+            with os.scandir(folder.path) as files:
+                for entry in files:
+                    if entry.name.endswith(".json") and entry.is_file():
+                        stat = entry.stat()
+                        entries.append((folder.name, entry.name, stat.st_mtime_ns, stat.st_size))
+
+    return tuple(sorted(entries, key=lambda item: (item[0], item[1] or "")))
+
+LYRIC_WORD_PATTERN = re.compile(r"\b\w+\b")
+
+def parse_timestamp_ms(value):
+
+    # "mm:ss", "hh:mm:ss" atau "mm:ss.fff"
+    try:
+        seconds = 0.0
+
+        for part in str(value).strip().split(":"):
+            seconds = seconds * 60 + float(part)
+
+        return int(round(seconds * 1000))
+    except ValueError:
+        return None
+
+def build_lyric_index(song_data):
+
+    lines = [
+        {
+            "index": index,
+            "item": item,
+            "start_ms": parse_timestamp_ms(item.get("start")),
+            "end_ms": parse_timestamp_ms(item.get("end")),
+            "words": tuple(LYRIC_WORD_PATTERN.findall(item["text"]))
+        }
+        for index, item in enumerate(song_data.get("timestamp", []))
+    ]
+
+    vocabulary = sorted({word for line in lines for word in line["words"]})
+    word_ids = {word: i for i, word in enumerate(vocabulary)}
+
+    for line in lines:
+        line["word_ids"] = tuple(word_ids[word] for word in line["words"])
+
+    # interval diurutkan menurut start; max_ends[i] = end terbesar dari interval 0..i
+    timed = sorted(
+        (line for line in lines if line["start_ms"] is not None and line["end_ms"] is not None),
+        key=lambda line: line["start_ms"]
+    )
+
+    return {
+        "lines": lines,
+        "vocabulary": vocabulary,
+        "intervals": timed,
+        "starts": [line["start_ms"] for line in timed],
+        "max_ends": list(itertools.accumulate((line["end_ms"] for line in timed), max))
+    }
+
+def find_active_lines(lyrics, from_ms, to_ms):
+
+    # baris aktif jika start <= to_ms dan end > from_ms
+    hi = bisect.bisect_right(lyrics["starts"], to_ms)
+    lo = bisect.bisect_right(lyrics["max_ends"], from_ms, 0, hi)
+
+    return [
+        line for line in lyrics["intervals"][lo:hi]
+        if line["end_ms"] > from_ms
+    ]
+
+def build_lyric_question(line, vocabulary, rng):
+
+    words = line["words"]
+
+    if len(words) < 2:
+        return None
+
+    remove_count = rng.randint(1, min(3, len(words)))
+    remove_indexes = sorted(rng.sample(range(len(words)), remove_count))
+
+    removed_words = [words[i] for i in remove_indexes]
+
+    blank_words = list(words)
+    for i in remove_indexes:
+        blank_words[i] = "____"
+
+    removed_ids = {line["word_ids"][i] for i in remove_indexes}
+    distractor_count = 5 - len(removed_ids)
+
+    # cukup ambil beberapa indeks lebih banyak dari yang dibutuhkan, tanpa perulangan acak
+    candidates = rng.sample(range(len(vocabulary)), min(len(vocabulary), distractor_count + len(removed_ids)))
+    distractors = [vocabulary[i] for i in candidates if i not in removed_ids]
+
+    options = list(dict.fromkeys(removed_words))
+    options.extend(distractors[:distractor_count])
+
+    rng.shuffle(options)
+
+    item = line["item"]
+
+    return {
+        "start": item["start"],
+        "end": item["end"],
+        "start_ms": line["start_ms"],
+        "end_ms": line["end_ms"],
+        "question": " ".join(blank_words),
+        "answer": removed_words,
+        "option": options,
+        "text": item["text"]
+    }
+
+def build_folk_song_catalog(signature):
+
+    songs = []
+    languages = {}
+    keys = {}
+
+    for language, filename, _, _ in signature:
+
+        if filename is None:
+            languages[language] = []
+            continue
+
+        with open(os.path.join(BASE_DATASET_PATH, language, filename), "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        song_key = os.path.splitext(filename)[0].lower()
+
+        songs.append(data)
+        languages[language].append(data)
+
+        # song_key yang sama di dua bahasa: yang pertama ditemukan dipakai
+        if song_key not in keys:
+            keys[song_key] = {"language": language, "data": data, "lyrics": build_lyric_index(data)}
+
+    return {
+        "songs": songs,
+        "languages": languages,
+        "keys": keys
+    }
+
+folk_song_catalog = ContentStore(folk_songs_signature, build_folk_song_catalog, CONTENT_REFRESH_SECONDS)
+
+def get_folk_song_catalog():
+    return folk_song_catalog.get()
+
+def find_folk_song(song_key):
+
+    song = get_folk_song_catalog()["keys"].get(song_key.lower())
+
+    if song is None:
+        raise HTTPException(status_code=404, detail="Song not found")
+
+    return song
+
+@app.get("/api/tutur/folk-songs")
+def get_all_folk_songs():
+
+    all_songs = get_folk_song_catalog()["songs"]
+
+    return {
+        "total": len(all_songs),
+        "songs": all_songs
+    }
+
+@app.get("/api/tutur/folk-songs/{language}")
+def get_songs_by_language(language: str = Path(...)):
+
+    songs = get_folk_song_catalog()["languages"].get(language.lower())
+
+    if songs is None:
+        raise HTTPException(status_code=404, detail="Language folder not found")
+
+    return {
+        "language": language,
+        "total": len(songs),
+        "songs": songs
+    }
+
+@app.get("/api/tutur/folk-song/{song_key}")
+def get_song_by_key(song_key: str):
+
+    return find_folk_song(song_key)["data"]
+
+@app.get("/api/tutur/test/folk-song/{song_key}")
+def generate_test_from_song(song_key: str, seed: Optional[int] = None):
+
+    song = find_folk_song(song_key)
+    song_data = song["data"]
+    lyrics = song["lyrics"]
+
+    rng = random.Random(derive_seed(song_key.lower(), seed) if seed is not None else None)
+
+    questions = []
+
+    for line in lyrics["lines"]:
+
+        question = build_lyric_question(line, lyrics["vocabulary"], rng)
+
+        if question is not None:
+            questions.append(question)
+
+    return {
+        "title": song_data.get("title"),
+        "lang": song_data.get("lang"),
+        "link": song_data.get("link"),
+        "start": song_data.get("start"),
+        "end": song_data.get("end"),
+        "total_questions": len(questions),
+        "timestamp": questions
+    }
+
+@app.get("/api/tutur/folk-song/{song_key}/lyrics")
+def get_song_lyrics_at(
+    song_key: str,
+    position_ms: Optional[int] = None,
+    from_ms: Optional[int] = None,
+    to_ms: Optional[int] = None,
+    seed: Optional[int] = None
+):
+
+    if position_ms is not None:
+        from_ms = to_ms = position_ms
+
+    if from_ms is None or to_ms is None:
+        raise HTTPException(status_code=400, detail="Provide position_ms or both from_ms and to_ms")
+
+    if from_ms < 0 or to_ms < from_ms:
+        raise HTTPException(status_code=400, detail="Invalid time range")
+
+    song = find_folk_song(song_key)
+    lyrics = song["lyrics"]
+
+    lines = []
+
+    for line in find_active_lines(lyrics, from_ms, to_ms):
+
+        # seed per baris supaya soal sama di jendela waktu mana pun
+        rng = random.Random(derive_seed(song_key.lower(), seed, line["index"]) if seed is not None else None)
+        item = line["item"]
+
+        lines.append({
+            "index": line["index"],
+            "start": item["start"],
+            "end": item["end"],
+            "start_ms": line["start_ms"],
+            "end_ms": line["end_ms"],
+            "text": item["text"],
+            "question": build_lyric_question(line, lyrics["vocabulary"], rng)
+        })
+
+    return {
+        "title": song["data"].get("title"),
+        "lang": song["data"].get("lang"),
+        "from_ms": from_ms,
+        "to_ms": to_ms,
+        "total": len(lines),
+        "lines": lines
+    }
+
+# NLP Model Translation Endpoint
+
+def lookup_translation(text: str, target_lang: str, source_lang: str = "english"):
+    key = normalize_lookup_text(text)
+    source_lang = source_lang.strip().lower()
+    target_lang = target_lang.strip().lower()
+
+    store = dataset_store
+
+    if target_lang not in store["language_columns"] or source_lang not in store["lookup"]:
+        return None
+
+    row = store["lookup"][source_lang].get(key)
+
+    if row is not None:
+        return store["columns"][target_lang][row]
+
+    return None
+
+def load_torch_backend():
+    import torch
+    from transformers import T5ForConditionalGeneration
+
+    model = T5ForConditionalGeneration.from_pretrained(MODEL_PATH)
+
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    model.to(device)
+    model.eval()
+
+    return model, device
+
+def load_torch_int8_backend():
+    import torch
+    from transformers import T5ForConditionalGeneration
+
+    model = T5ForConditionalGeneration.from_pretrained(MODEL_PATH)
+    model.eval()
+
+    # kuantisasi dinamis hanya berjalan di CPU
+    model = torch.quantization.quantize_dynamic(
+        model,
+        {torch.nn.Linear},
+        dtype=torch.qint8
+    )
+
+    return model, torch.device("cpu")
+
+def load_onnx_backend():
+    import torch
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+
+    if not os.path.exists(ONNX_MODEL_PATH):
+        raise FileNotFoundError(
+            f"ONNX model folder '{ONNX_MODEL_PATH}' not found, run modelGenerator/exportOnnx.py first"
+        )
+
+    model = ORTModelForSeq2SeqLM.from_pretrained(ONNX_MODEL_PATH)
+
+    return model, torch.device("cpu")
+
+TRANSLATOR_BACKENDS = {
+    "torch": load_torch_backend,
+    "torch_int8": load_torch_int8_backend,
+    "onnx": load_onnx_backend,
+}
+
+translator_state = {
+    "status": "idle",
+    "backend": TRANSLATOR_BACKEND,
+    "error": None,
+    "tokenizer": None,
+    "model": None,
+    "device": None,
+    "loadSeconds": None,
+    "failedAt": None
+}
+translator_state_lock = threading.Lock()
+
+def load_translator():
+
+    started = time.perf_counter()
+
+    try:
+        # import berat ditunda supaya endpoint non-NLP bisa langsung jalan
+        import torch
+        from transformers import T5Tokenizer
+
+        if TORCH_INTRA_OP_THREADS > 0:
+            torch.set_num_threads(TORCH_INTRA_OP_THREADS)
+
+        if TRANSLATOR_BACKEND not in TRANSLATOR_BACKENDS:
+            raise ValueError(f"Unknown translator backend '{TRANSLATOR_BACKEND}'")
+
+        if not os.path.exists(MODEL_PATH):
+            raise FileNotFoundError(f"Model folder '{MODEL_PATH}' not found")
+
+        tokenizer = T5Tokenizer.from_pretrained(MODEL_PATH)
+        model, device = TRANSLATOR_BACKENDS[TRANSLATOR_BACKEND]()
+
+    except Exception as e:
+        print("TRANSLATOR LOAD ERROR:", str(e))
+
+        with translator_state_lock:
+            translator_state["status"] = "failed"
+            translator_state["error"] = str(e)
+            translator_state["failedAt"] = time.monotonic()
+
+        return
+
+    with translator_state_lock:
+        translator_state["tokenizer"] = tokenizer
+        translator_state["model"] = model
+        translator_state["device"] = device
+        translator_state["loadSeconds"] = round(time.perf_counter() - started, 2)
+        translator_state["error"] = None
+        translator_state["status"] = "ready"
+
+def start_translator_loading():
+
+    with translator_state_lock:
+
+        if translator_state["status"] in ["loading", "ready"]:
+            return
+
+        translator_state["status"] = "loading"
+        translator_state["error"] = None
+
+    threading.Thread(target=load_translator, daemon=True).start()
+
+def get_translator():
+
+    if translator_state["status"] == "ready":
+        return translator_state
+
+    if translator_state["status"] == "idle":
+        start_translator_loading()
+
+    if translator_state["status"] == "failed":
+
+        # gagal muat bisa sementara, jadi coba lagi setelah TRANSLATOR_RETRY_AFTER detik
+        waited = time.monotonic() - translator_state["failedAt"]
+
+        if waited >= float(TRANSLATOR_RETRY_AFTER):
+            start_translator_loading()
+        else:
+            raise HTTPException(
+                status_code=503,
+                detail=f"Translator model unavailable: {translator_state['error']}",
+                headers={"Retry-After": str(math.ceil(float(TRANSLATOR_RETRY_AFTER) - waited))}
+            )
+
+    raise HTTPException(
+        status_code=503,
+        detail="Translator model is loading",
+        headers={"Retry-After": TRANSLATOR_RETRY_AFTER}
+    )
+
+@app.get("/api/tutur/translate/status")
+def get_translator_status():
+
+    status = translator_state["status"]
+
+    content = {
+        "status": status,
+        "backend": translator_state["backend"],
+        "error": translator_state["error"],
+        "device": str(translator_state["device"]) if translator_state["device"] else None,
+        "loadSeconds": translator_state["loadSeconds"]
+    }
+
+    if status == "ready":
+        return JSONResponse(content=content)
+
+    headers = {"Retry-After": TRANSLATOR_RETRY_AFTER} if status in ["loading", "failed"] else None
+
+    return JSONResponse(status_code=503, content=content, headers=headers)
+
+# semua inferensi berjalan di pool ini supaya tidak memakai threadpool Starlette
+inference_executor = ThreadPoolExecutor(
+    max_workers=INFERENCE_WORKERS,
+    thread_name_prefix="inference"
+)
+
+class TranslationQueueFull(Exception):
+    pass
+
+DECODING_PROFILES = {
+    "greedy": {"num_beams": 1, "use_cache": False},
+    "greedy_kv": {"num_beams": 1, "use_cache": True},
+    "beam2": {"num_beams": 2, "early_stopping": True},
+    "beam4": {"num_beams": 4, "early_stopping": True},
+    "beam8": {"num_beams": 8, "early_stopping": True},
+}
+
+# profil termurah yang dipakai saat latency budget terlampaui
+FALLBACK_DECODING_PROFILE = "greedy_kv"
+
+decoding_latency_ms = {}
+
+def resolve_decoding_profile(profile):
+
+    profile = (profile or TRANSLATE_DECODING_PROFILE).strip().lower()
+
+    if profile not in DECODING_PROFILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown decoding profile '{profile}' (available: {', '.join(DECODING_PROFILES)})"
+        )
+
+    return profile
+
+def estimate_translate_latency_ms(profile):
+
+    average_ms = decoding_latency_ms.get(profile)
+
+    if average_ms is None:
+        return 0
+
+    batches_ahead = translation_batcher.queue.qsize() // TRANSLATE_MAX_BATCH
+
+    return (batches_ahead + 1) * average_ms
+
+def choose_decoding_profile(profile, latency_budget_ms):
+
+    profile = resolve_decoding_profile(profile)
+
+    if latency_budget_ms is None:
+        latency_budget_ms = TRANSLATE_LATENCY_BUDGET_MS
+
+    if latency_budget_ms and estimate_translate_latency_ms(profile) > latency_budget_ms:
+        return FALLBACK_DECODING_PROFILE
+
+    return profile
+
+def generate_translations(tokenizer, model, device, input_texts, profile="beam4"):
+
+    import torch
+
+    inputs = tokenizer(
+        input_texts,
+        return_tensors="pt",
+        max_length=64,
+        truncation=True,
+        padding=True
+    ).to(device)
 
-        for topic in courses.values():
-            for item in topic:
+    # batas token keluaran mengikuti panjang input terpanjang di batch
+    input_length = int(inputs["attention_mask"].sum(dim=1).max())
+    max_new_tokens = min(
+        TRANSLATE_MAX_NEW_TOKENS,
+        math.ceil(input_length * TRANSLATE_LENGTH_RATIO) + 4
+    )
 
-                step = item["step"]
+    with torch.no_grad():
+        outputs = model.generate(
+            **inputs,
+            max_new_tokens=max_new_tokens,
+            **DECODING_PROFILES[profile]
+        )
 
-                if "listWords" in item:
+    return tokenizer.batch_decode(outputs, skip_special_tokens=True)
 
-                    rows = item["listWords"]
-                    words_df = df[df["row_position"].isin(rows)]
+def model_translate_batch(input_texts, profile=None):
 
-                    questions = generate_word_questions(words_df, dominant, local)
+    profile = resolve_decoding_profile(profile)
+    translator = get_translator()
 
-                elif "listPhrases" in item:
+    started = time.perf_counter()
 
-                    prev_step = find_step(courses, step - 1)
+    results = generate_translations(
+        translator["tokenizer"],
+        translator["model"],
+        translator["device"],
+        input_texts,
+        profile
+    )
 
-                    if not prev_step:
-                        continue
+    generation_ms = (time.perf_counter() - started) * 1000
 
-                    phrase_df = df[df["row_position"].isin(item["listPhrases"])]
-                    word_df = df[df["row_position"].isin(prev_step["listWords"])]
+    previous_ms = decoding_latency_ms.get(profile)
+    decoding_latency_ms[profile] = (
+        generation_ms if previous_ms is None else 0.8 * previous_ms + 0.2 * generation_ms
+    )
 
-                    questions = generate_phrase_questions(
-                        phrase_df,
-                        word_df,
-                        dominant,
-                        local
-                    )
+    return results, generation_ms
 
-                elif "listSentences" in item:
+class TranslationBatcher:
 
-                    word_step = find_step(courses, step - 2)
+    def __init__(self, run_batch, executor, workers, max_batch, window_ms, queue_limit):
+        self.run_batch = run_batch
+        self.executor = executor
+        self.slots = threading.Semaphore(workers)
+        self.max_batch = max_batch
+        self.window = window_ms / 1000
+        self.queue_limit = queue_limit
+        self.queue = queue.Queue()
+        self.pending = 0
+        self.pending_lock = threading.Lock()
+        self.worker = None
+        self.worker_lock = threading.Lock()
 
-                    if not word_step:
-                        continue
+    def submit(self, input_text, profile):
+        return self.submit_many([input_text], profile)[0]
 
-                    sentence_df = df[df["row_position"].isin(item["listSentences"])]
-                    word_df = df[df["row_position"].isin(word_step["listWords"])]
+    def submit_many(self, input_texts, profile):
 
-                    questions = generate_sentence_questions(
-                        sentence_df,
-                        word_df,
-                        dominant,
-                        local
-                    )
+        with self.worker_lock:
+            if self.worker is None:
+                self.worker = threading.Thread(target=self.run, daemon=True)
+                self.worker.start()
 
-                else:
-                    continue
+        # satu chunk diterima utuh atau ditolak utuh, supaya antrean tidak lewat batas
+        with self.pending_lock:
 
-                result.append({
-                    "step": step,
-                    "questions": questions
-                })
+            if self.pending + len(input_texts) > self.queue_limit:
+                raise TranslationQueueFull()
 
-        result = sorted(result, key=lambda x: x["step"])
+            self.pending += len(input_texts)
 
-        return {
-            "total_step": len(result),
-            "total_questions": len(result) * 10,
-            "courses": result
-        }
-    except Exception as e:
-        print(e)
-        raise HTTPException(status_code=500, detail=str(e))
+        futures = []
 
-@app.get("/api/tutur/course/{step}/{dominant}/{local}")
-def get_course_by_step(step: int, dominant: str, local: str):
+        for input_text in input_texts:
+            future = Future()
+            future.add_done_callback(self.release_pending)
+            self.queue.put((input_text, profile, future))
+            futures.append(future)
 
-    if dominant not in df.columns or local not in df.columns:
-        raise HTTPException(status_code=400, detail="Language column not found")
+        return futures
 
-    if not os.path.exists(COURSE_PATH):
-        raise HTTPException(status_code=404, detail="Course file not found")
+    def release_pending(self, future):
 
-    with open(COURSE_PATH, "r", encoding="utf-8") as f:
-        courses = json.load(f)
+        with self.pending_lock:
+            self.pending -= 1
 
-    selected_step = None
-    previous_step = None
-    word_step = None
+    def collect(self):
 
-    for topic in courses.values():
-        for item in topic:
+        batch = [self.queue.get()]
+        deadline = time.monotonic() + self.window
 
-            if item["step"] == step:
-                selected_step = item
+        while len(batch) < self.max_batch:
 
-            if item["step"] == step - 1:
-                previous_step = item
+            remaining = deadline - time.monotonic()
 
-            if item["step"] == step - 2:
-                word_step = item
+            if remaining <= 0:
+                break
 
-    if not selected_step:
-        raise HTTPException(status_code=404, detail="Step not found")
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
 
-    if "listWords" in selected_step:
+        return batch
 
-        rows = selected_step["listWords"]
-        words_df = df[df["row_position"].isin(rows)]
+    def run(self):
 
-        questions = generate_word_questions(words_df, dominant, local)
+        while True:
 
-    elif "listPhrases" in selected_step:
+            # tunggu worker kosong dulu supaya request yang menumpuk
+            # terkumpul menjadi batch yang lebih besar
+            self.slots.acquire()
 
-        phrase_df = df[df["row_position"].isin(selected_step["listPhrases"])]
-        word_df = df[df["row_position"].isin(previous_step["listWords"])]
+            groups = {}
 
-        questions = generate_phrase_questions(phrase_df, word_df, dominant, local)
+            for input_text, profile, future in self.collect():
+                groups.setdefault(profile, []).append((input_text, future))
 
-    elif "listSentences" in selected_step:
+            self.executor.submit(self.run_groups, groups)
 
-        sentence_df = df[df["row_position"].isin(selected_step["listSentences"])]
-        word_df = df[df["row_position"].isin(word_step["listWords"])]
+    def run_groups(self, groups):
 
-        questions = generate_sentence_questions(sentence_df, word_df, dominant, local)
+        try:
+            for profile, group in groups.items():
 
-    else:
-        raise HTTPException(status_code=400, detail="Unknown step type")
+                # lewati request yang sudah dibatalkan (client terputus)
+                group = [
+                    (input_text, future)
+                    for input_text, future in group
+                    if future.set_running_or_notify_cancel()
+                ]
 
-    return {"questions": questions}
+                if not group:
+                    continue
 
-# Urban Legends Endpoint
+                try:
+                    results, generation_ms = self.run_batch(
+                        [input_text for input_text, _ in group],
+                        profile
+                    )
+                except Exception as e:
+                    for _, future in group:
+                        future.set_exception(e)
+                    continue
 
-@app.get("/api/tutur/urban-legends")
-def get_all_urban_legends():
+                for (_, future), result in zip(group, results):
+                    future.set_result((result, generation_ms))
 
-    if not os.path.exists(URBAN_LEGENDS_PATH):
-        raise HTTPException(status_code=404, detail="urbanLegends folder not found")
+        finally:
+            self.slots.release()
 
-    all_data = {}
+translation_batcher = TranslationBatcher(
+    model_translate_batch,
+    inference_executor,
+    workers=INFERENCE_WORKERS,
+    max_batch=TRANSLATE_MAX_BATCH,
+    window_ms=TRANSLATE_BATCH_WINDOW_MS,
+    queue_limit=TRANSLATE_QUEUE_LIMIT
+)
 
-    for filename in os.listdir(URBAN_LEGENDS_PATH):
+translation_cache = LRUCache(TRANSLATION_CACHE_SIZE, TRANSLATION_CACHE_TTL)
+translation_cache_db = None
+translation_cache_db_lock = threading.Lock()
+translation_cache_db_stats = {"hits": 0, "misses": 0, "writes": 0, "rows": 0, "pruned": 0}
 
-        if filename.endswith(".json"):
-            file_path = os.path.join(URBAN_LEGENDS_PATH, filename)
+# SQLite memblokir, jadi baca/tulis tier persisten tidak boleh jalan di event loop
+translation_cache_db_executor = ThreadPoolExecutor(
+    max_workers=1,
+    thread_name_prefix="translation-cache"
+)
 
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                all_data.update(data)
+def remaining_translation_ttl(created_at):
 
-    return all_data
+    # sisa umur entri, supaya memuat ulang dari disk tidak memperpanjang TTL
+    if not TRANSLATION_CACHE_TTL:
+        return None
 
-@app.get("/api/tutur/urban-legends/{lang}")
-def get_urban_legend_by_lang(lang: str):
+    return created_at + TRANSLATION_CACHE_TTL - time.time()
 
-    file_path = os.path.join(URBAN_LEGENDS_PATH, f"{lang}.json")
+def prune_translation_cache_db(connection):
 
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="Language file not found")
+    pruned = 0
 
-    with open(file_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    if TRANSLATION_CACHE_TTL:
+        pruned += connection.execute(
+            "DELETE FROM translations WHERE created_at <= ?",
+            (time.time() - TRANSLATION_CACHE_TTL,)
+        ).rowcount
 
-    return data
+    translation_cache_db_stats["rows"] -= pruned
 
-@app.get("/api/tutur/urban-legends/test/{lang}/{title}")
-def generate_urban_legend_test(lang: str, title: str):
+    # buang baris tertua jika jumlahnya melewati batas cache
+    overflow = translation_cache_db_stats["rows"] - TRANSLATION_CACHE_SIZE
 
-    if not lang.isalpha():
-        raise HTTPException(status_code=400, detail="Invalid language parameter")
+    if overflow > 0:
+        deleted = connection.execute(
+            "DELETE FROM translations WHERE cache_key IN ("
+            "SELECT cache_key FROM translations ORDER BY created_at LIMIT ?)",
+            (overflow,)
+        ).rowcount
+        translation_cache_db_stats["rows"] -= deleted
+        pruned += deleted
 
-    file_path = os.path.join(URBAN_LEGENDS_PATH, f"{lang}.json")
-    
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="Language file not found")
+    translation_cache_db_stats["pruned"] += pruned
 
-    with open(file_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+def open_translation_cache_db(path):
 
-    if title not in data:
-        raise HTTPException(status_code=404, detail="Story title not found")
+    connection = sqlite3.connect(path, check_same_thread=False)
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS translations ("
+        "cache_key TEXT PRIMARY KEY, "
+        "translated_text TEXT NOT NULL, "
+        "created_at REAL NOT NULL)"
+    )
+    connection.execute(
+        "CREATE INDEX IF NOT EXISTS translations_created_at ON translations (created_at)"
+    )
 
-    story_data = data[title]
-    story_sentences = story_data.get("story", [])
+    translation_cache_db_stats["rows"] = connection.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+    prune_translation_cache_db(connection)
+    connection.commit()
 
-    if not story_sentences:
-        raise HTTPException(status_code=404, detail="Story content empty")
+    # muat entri terbaru supaya cache langsung hangat setelah restart
+    rows = connection.execute(
+        "SELECT cache_key, translated_text, created_at FROM translations "
+        "ORDER BY created_at DESC LIMIT ?",
+        (TRANSLATION_CACHE_SIZE,)
+    ).fetchall()
 
-    full_text = " ".join(story_sentences).lower()
+    for cache_key, translated_text, created_at in reversed(rows):
+        ttl = remaining_translation_ttl(created_at)
 
-    full_text = re.sub(r"[^\w\s]", "", full_text)
+        if ttl is None or ttl > 0:
+            translation_cache.set(cache_key, translated_text, ttl)
 
-    all_words = list(set(full_text.split()))
+    return connection
 
-    questions = []
+if TRANSLATION_CACHE_DB:
+    translation_cache_db = open_translation_cache_db(TRANSLATION_CACHE_DB)
 
-    for sentence in story_sentences:
+def translation_cache_key(text, target_lang, source_lang, profile):
+    normalized = " ".join(text.lower().split())
+    # backend dan batas panjang ikut menentukan hasil, jadi ikut masuk ke key
+    settings = f"{TRANSLATOR_BACKEND}:{profile}:{TRANSLATE_MAX_NEW_TOKENS}:{TRANSLATE_LENGTH_RATIO}"
+    return f"{source_lang}|{target_lang}|{settings}|{normalized}"
 
-        clean_sentence = re.sub(r"[^\w\s]", "", sentence)
-        words = clean_sentence.split()
+def read_persistent_translation(cache_key):
 
-        if len(words) < 3:
-            continue
+    with translation_cache_db_lock:
+        row = translation_cache_db.execute(
+            "SELECT translated_text, created_at FROM translations WHERE cache_key = ?",
+            (cache_key,)
+        ).fetchone()
 
-        blank_count = random.randint(1, min(3, len(words)))
-        removed_words = random.sample(words, blank_count)
+        ttl = None if row is None else remaining_translation_ttl(row[1])
 
-        blank_sentence = sentence
-        for word in removed_words:
-            blank_sentence = blank_sentence.replace(word, "____", 1)
+        if row is None or (ttl is not None and ttl <= 0):
+            translation_cache_db_stats["misses"] += 1
+            return None
 
-        distractors = [w for w in all_words if w not in removed_words]
-        random.shuffle(distractors)
+        translation_cache_db_stats["hits"] += 1
 
-        options = distractors[:5 - len(removed_words)]
-        options.extend(removed_words)
+    translation_cache.set(cache_key, row[0], ttl)
 
-        options = list(set(options))
-        random.shuffle(options)
+    return row[0]
 
-        questions.append({
-            "question": blank_sentence,
-            "options": options,
-            "answer": removed_words
-        })
+def write_persistent_translation(cache_key, translated_text):
 
-    return {
-        "title": story_data.get("title"),
-        "lang": story_data.get("lang"),
-        "questions": questions
-    }
+    try:
+        with translation_cache_db_lock:
+            exists = translation_cache_db.execute(
+                "SELECT 1 FROM translations WHERE cache_key = ?",
+                (cache_key,)
+            ).fetchone()
+
+            translation_cache_db.execute(
+                "INSERT OR REPLACE INTO translations (cache_key, translated_text, created_at) "
+                "VALUES (?, ?, ?)",
+                (cache_key, translated_text, time.time())
+            )
 
-# Folk Song Endpoint
+            if exists is None:
+                translation_cache_db_stats["rows"] += 1
 
-@app.get("/api/tutur/folk-songs")
-def get_all_folk_songs():
+            prune_translation_cache_db(translation_cache_db)
+            translation_cache_db.commit()
+            translation_cache_db_stats["writes"] += 1
+    except Exception as e:
+        print("TRANSLATION CACHE WRITE ERROR:", str(e))
 
-    if not os.path.exists(BASE_DATASET_PATH):
-        raise HTTPException(status_code=404, detail="Dataset folder not found")
+async def get_cached_translation(cache_key):
 
-    all_songs = []
+    cached = translation_cache.get(cache_key)
 
-    for language_folder in os.listdir(BASE_DATASET_PATH):
-        language_path = os.path.join(BASE_DATASET_PATH, language_folder)
+    if cached is not None or translation_cache_db is None:
+        return cached
 
-        if os.path.isdir(language_path):
+    return await asyncio.wrap_future(
+        translation_cache_db_executor.submit(read_persistent_translation, cache_key)
+    )
 
-            for file in os.listdir(language_path):
-                if file.endswith(".json"):
-                    file_path = os.path.join(language_path, file)
+def set_cached_translation(cache_key, translated_text):
 
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                        all_songs.append(data)
+    translation_cache.set(cache_key, translated_text)
 
-    return {
-        "total": len(all_songs),
-        "songs": all_songs
-    }
+    if translation_cache_db is None:
+        return
 
-@app.get("/api/tutur/folk-songs/{language}")
-def get_songs_by_language(language: str = Path(...)):
+    # tidak ditunggu: response tidak perlu menunggu commit ke disk
+    translation_cache_db_executor.submit(write_persistent_translation, cache_key, translated_text)
 
-    language_path = os.path.join(BASE_DATASET_PATH, language.lower())
+async def model_translate(
+    text: str,
+    target_lang: str,
+    source_lang: str = "english",
+    profile: Optional[str] = None,
+    latency_budget_ms: Optional[float] = None
+):
 
-    if not os.path.exists(language_path):
-        raise HTTPException(status_code=404, detail="Language folder not found")
+    profile = choose_decoding_profile(profile, latency_budget_ms)
 
-    songs = []
+    cache_key = translation_cache_key(text, target_lang, source_lang, profile)
+    cached = await get_cached_translation(cache_key)
 
-    for file in os.listdir(language_path):
-        if file.endswith(".json"):
-            file_path = os.path.join(language_path, file)
+    if cached is not None:
+        return cached, {"profile": profile, "generation_ms": 0, "cached": True}
 
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                songs.append(data)
+    # cek kesiapan model sebelum masuk antrean batch
+    get_translator()
 
-    return {
-        "language": language,
-        "total": len(songs),
-        "songs": songs
-    }
+    input_text = f"translate {source_lang} to {target_lang}: {text}"
 
-@app.get("/api/tutur/folk-song/{song_key}")
-def get_song_by_key(song_key: str):
+    try:
+        future = translation_batcher.submit(input_text, profile)
+    except TranslationQueueFull:
+        raise HTTPException(
+            status_code=429,
+            detail="Translation queue is full, please retry later",
+            headers={"Retry-After": "1"}
+        )
 
-    if not os.path.exists(BASE_DATASET_PATH):
-        raise HTTPException(status_code=404, detail="Dataset folder not found")
-    
-    for language_folder in os.listdir(BASE_DATASET_PATH):
-        language_path = os.path.join(BASE_DATASET_PATH, language_folder)
+    result, generation_ms = await asyncio.wrap_future(future)
 
-        if os.path.isdir(language_path):
+    set_cached_translation(cache_key, result)
 
-            for file in os.listdir(language_path):
-                if file.endswith(".json"):
+    return result, {
+        "profile": profile,
+        "generation_ms": round(generation_ms, 2),
+        "cached": False
+    }
 
-                    file_name_without_ext = os.path.splitext(file)[0]
+@app.get("/api/tutur/translate/cache")
+def get_translation_cache_stats():
 
-                    if file_name_without_ext.lower() == song_key.lower():
-                        file_path = os.path.join(language_path, file)
+    stats = translation_cache.stats()
 
-                        with open(file_path, "r", encoding="utf-8") as f:
-                            data = json.load(f)
+    if translation_cache_db is not None:
+        with translation_cache_db_lock:
+            stats["persistent"] = dict(translation_cache_db_stats)
 
-                        return data
+    return stats
 
-    raise HTTPException(status_code=404, detail="Song not found")
+@app.post("/api/tutur/translate")
+async def translate(req: TranslateRequest):
 
-@app.get("/api/tutur/test/folk-song/{song_key}")
-def generate_test_from_song(song_key: str):
+    text = req.text.strip()
+    source_lang = req.source_language.strip().lower()
+    target_lang = req.target_language.lower()
 
-    if not os.path.exists(BASE_DATASET_PATH):
-        raise HTTPException(status_code=404, detail="Dataset folder not found")
+    if not text:
+        raise HTTPException(status_code=400, detail="Text cannot be empty")
 
-    song_data = None
+    direct_result = lookup_translation(text, target_lang, source_lang)
 
-    for language_folder in os.listdir(BASE_DATASET_PATH):
-        language_path = os.path.join(BASE_DATASET_PATH, language_folder)
+    if direct_result:
+        return {
+            "method": "dataset_lookup",
+            "source_language": source_lang,
+            "target_language": target_lang,
+            "original_text": text,
+            "translated_text": direct_result
+        }
 
-        if os.path.isdir(language_path):
-            for file in os.listdir(language_path):
-                if file.endswith(".json"):
-                    name_without_ext = os.path.splitext(file)[0]
+    model_result, decoding = await model_translate(
+        text,
+        target_lang,
+        source_lang,
+        req.decoding_profile,
+        req.latency_budget_ms
+    )
 
-                    if name_without_ext.lower() == song_key.lower():
-                        file_path = os.path.join(language_path, file)
-                        with open(file_path, "r", encoding="utf-8") as f:
-                            song_data = json.load(f)
-                        break
+    return {
+        "method": "model_inference",
+        "source_language": source_lang,
+        "target_language": target_lang,
+        "original_text": text,
+        "translated_text": model_result,
+        "decoding": decoding
+    }
 
-    if not song_data:
-        raise HTTPException(status_code=404, detail="Song not found")
+def ndjson_line(data):
+    return (json.dumps(data, ensure_ascii=False) + "\n").encode("utf-8")
 
-    timestamps = song_data.get("timestamp", [])
+BULK_QUEUE_RETRY_SECONDS = 0.05
 
-    word_pool = []
-    for item in timestamps:
-        words = re.findall(r'\b\w+\b', item["text"])
-        word_pool.extend(words)
+async def translate_batch_stream(items):
 
-    word_pool = list(set(word_pool))
+    misses = {}
 
-    questions = []
+    for index, item in enumerate(items):
 
-    for item in timestamps:
+        text = item.text.strip()
+        source_lang = item.source_language.strip().lower()
+        target_lang = item.target_language.lower()
 
-        original_text = item["text"]
-        words = re.findall(r'\b\w+\b', original_text)
+        if not text:
+            yield ndjson_line({
+                "index": index,
+                "error": "Text cannot be empty"
+            })
+            continue
 
-        if len(words) < 2:
+        try:
+            profile = resolve_decoding_profile(item.decoding_profile)
+        except HTTPException as e:
+            yield ndjson_line({"index": index, "error": e.detail})
             continue
 
-        remove_count = random.randint(1, min(3, len(words)))
-        remove_indexes = sorted(random.sample(range(len(words)), remove_count))
+        direct_result = lookup_translation(text, target_lang, source_lang)
 
-        removed_words = [words[i] for i in remove_indexes]
+        if direct_result:
+            yield ndjson_line({
+                "index": index,
+                "method": "dataset_lookup",
+                "source_language": source_lang,
+                "target_language": target_lang,
+                "original_text": text,
+                "translated_text": direct_result
+            })
+            continue
 
-        blank_words = words.copy()
-        for i in remove_indexes:
-            blank_words[i] = "____"
+        cache_key = translation_cache_key(text, target_lang, source_lang, profile)
+        cached = await get_cached_translation(cache_key)
+
+        if cached is not None:
+            yield ndjson_line({
+                "index": index,
+                "method": "model_inference",
+                "source_language": source_lang,
+                "target_language": target_lang,
+                "original_text": text,
+                "translated_text": cached,
+                "decoding": {"profile": profile, "generation_ms": 0, "cached": True}
+            })
+            continue
 
-        question_sentence = " ".join(blank_words)
+        # teks yang sama (setelah normalisasi) hanya diterjemahkan sekali
+        group = misses.setdefault((source_lang, target_lang, profile), {})
+        group.setdefault(cache_key, (text, []))[1].append((index, text))
 
-        options = removed_words.copy()
+    # chunk lebih besar dari batas antrean tidak akan pernah diterima
+    chunk_size = max(1, min(TRANSLATE_MAX_BATCH, TRANSLATE_QUEUE_LIMIT))
 
-        distractor_pool = [w for w in word_pool if w not in removed_words]
+    chunks = []
 
-        while len(options) < 5 and distractor_pool:
-            random_word = random.choice(distractor_pool)
-            if random_word not in options:
-                options.append(random_word)
+    for (source_lang, target_lang, profile), group in misses.items():
+        entries = list(group.items())
 
-        random.shuffle(options)
+        for start in range(0, len(entries), chunk_size):
+            chunks.append((source_lang, target_lang, profile, entries[start:start + chunk_size]))
 
-        questions.append({
-            "start": item["start"],
-            "end": item["end"],
-            "question": question_sentence,
-            "answer": removed_words,
-            "option": options,
-            "text": original_text
-        })
+    async def run_chunk(chunk):
 
-    return {
-        "title": song_data.get("title"),
-        "lang": song_data.get("lang"),
-        "link": song_data.get("link"),
-        "start": song_data.get("start"),
-        "end": song_data.get("end"),
-        "total_questions": len(questions),
-        "timestamp": questions
-    }
+        source_lang, target_lang, profile, entries = chunk
+        input_texts = [f"translate {source_lang} to {target_lang}: {text}" for _, (text, _) in entries]
 
-# NLP Model Translation Endpoint
+        # chunk bulk ikut antrean batcher yang sama dengan /translate,
+        # jadi dihitung dalam TRANSLATE_QUEUE_LIMIT dan memakai slot worker
+        while True:
+            try:
+                futures = translation_batcher.submit_many(input_texts, profile)
+                break
+            except TranslationQueueFull:
+                await asyncio.sleep(BULK_QUEUE_RETRY_SECONDS)
 
-def lookup_translation(text: str, target_lang: str):
-    text = text.strip().lower()
-    target_lang = target_lang.strip().lower()
+        outcomes = await asyncio.gather(
+            *(asyncio.wrap_future(future) for future in futures),
+            return_exceptions=True
+        )
 
-    if target_lang not in df.columns:
-        return None
+        return chunk, outcomes
 
-    match = df[df["english"].str.lower() == text]
+    # beberapa chunk berjalan bersamaan supaya semua worker inferensi terpakai
+    pending = set()
+    next_chunk = 0
 
-    if not match.empty:
-        return match.iloc[0][target_lang]
+    try:
+        while next_chunk < len(chunks) or pending:
 
-    return None
+            while next_chunk < len(chunks) and len(pending) < max(1, INFERENCE_WORKERS):
+                pending.add(asyncio.ensure_future(run_chunk(chunks[next_chunk])))
+                next_chunk += 1
 
-def model_translate(text: str, target_lang: str):
-    input_text = f"translate english to {target_lang}: {text}"
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
 
-    inputs = tokenizer(
-        input_text,
-        return_tensors="pt",
-        max_length=64,
-        truncation=True
-    ).to(device)
+            for task in done:
 
-    with torch.no_grad():
-        outputs = model.generate(
-            **inputs,
-            max_length=64,
-            num_beams=4,
-            early_stopping=True
-        )
+                (source_lang, target_lang, profile, entries), outcomes = task.result()
 
-    return tokenizer.decode(outputs[0], skip_special_tokens=True)
+                for (cache_key, (_, requests)), outcome in zip(entries, outcomes):
 
-@app.post("/api/tutur/translate")
-def translate(req: TranslateRequest):
+                    if isinstance(outcome, HTTPException):
+                        for index, _ in requests:
+                            yield ndjson_line({"index": index, "error": outcome.detail})
+                        continue
 
-    text = req.text.strip()
-    target_lang = req.target_language.lower()
+                    if isinstance(outcome, Exception):
+                        for index, _ in requests:
+                            yield ndjson_line({"index": index, "error": str(outcome)})
+                        continue
 
-    if not text:
-        raise HTTPException(status_code=400, detail="Text cannot be empty")
+                    result, generation_ms = outcome
+
+                    set_cached_translation(cache_key, result)
+
+                    for index, text in requests:
+                        yield ndjson_line({
+                            "index": index,
+                            "method": "model_inference",
+                            "source_language": source_lang,
+                            "target_language": target_lang,
+                            "original_text": text,
+                            "translated_text": result,
+                            "decoding": {
+                                "profile": profile,
+                                "generation_ms": round(generation_ms, 2),
+                                "cached": False
+                            }
+                        })
+    finally:
+        # client terputus: chunk yang belum dikirim tidak perlu menunggu antrean
+        for task in pending:
+            task.cancel()
 
-    direct_result = lookup_translation(text, target_lang)
+@app.post("/api/tutur/translate/batch")
+async def translate_batch(req: BatchTranslateRequest):
 
-    if direct_result:
-        return {
-            "method": "dataset_lookup",
-            "source_language": "english",
-            "target_language": target_lang,
-            "original_text": text,
-            "translated_text": direct_result
-        }
+    if not req.items:
+        raise HTTPException(status_code=400, detail="Items cannot be empty")
 
-    model_result = model_translate(text, target_lang)
+    if len(req.items) > TRANSLATE_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many items (max {TRANSLATE_BULK_MAX_ITEMS})"
+        )
 
-    return {
-        "method": "model_inference",
-        "source_language": "english",
-        "target_language": target_lang,
-        "original_text": text,
-        "translated_text": model_result
-    }
+    return StreamingResponse(
+        translate_batch_stream(req.items),
+        media_type="application/x-ndjson"
+    )
 
 # Community Participation Endpoints
 
@@ -1348,22 +2918,11 @@ def add_language(data: AddLanguageRequest, db: Session = Depends(get_db)):
     if not os.path.exists(user_folder):
         raise HTTPException(status_code=404, detail="Participant folder hasn't been created")
 
-    # path dataset excel
-    dataset_path = os.path.join(
-        base_dir,
-        "datasets",
-        "DatasetLanguage.xlsx"
-    )
-
-    if not os.path.exists(dataset_path):
-        raise HTTPException(status_code=404, detail="Dataset file not found")
-
-    # baca excel
-    df = pd.read_excel(dataset_path)
+    store = dataset_store
 
     dominant_lang = normalize_language_name(data.dominantLanguage)
 
-    if dominant_lang not in df.columns:
+    if dominant_lang not in store["language_columns"]:
         raise HTTPException(
             status_code=400,
             detail=f"Dominant language '{dominant_lang}' not found in dataset"
@@ -1374,16 +2933,17 @@ def add_language(data: AddLanguageRequest, db: Session = Depends(get_db)):
 
     translations = []
 
-    for index, row in df.iterrows():
-
-        source_text = row[dominant_lang]
-        row_type = row["type"] if "type" in df.columns else "phrase"
+    for row_position, row_type, source_text in zip(
+        store["row_position"],
+        store["columns"]["type"],
+        store["columns"][dominant_lang]
+    ):
 
-        if pd.isna(source_text):
+        if source_text == "":
             continue
 
         translations.append({
-            "row_position": int(index) + 2,
+            "row_position": int(row_position),
             "type": row_type,
             "source": source_text,
             "translation": None
@@ -1711,30 +3271,27 @@ def save_language(
             detail=f"Translation progress not complete ({round(progress,2)}%)"
         )
 
-    dataset_path = os.path.join(
-        base_dir,
-        "datasets",
-        "DatasetLanguage.xlsx"
-    )
+    with dataset_lock:
 
-    if not os.path.exists(dataset_path):
-        raise HTTPException(status_code=404, detail="DatasetLanguage.xlsx not found")
+        store = dataset_store
 
-    df = pd.read_excel(dataset_path)
+        if language_key in store["language_columns"]:
+            raise HTTPException(status_code=400, detail="Language already exists")
 
-    if language_key in df.columns:
-        raise HTTPException(status_code=400, detail="Language already exists")
+        df = store["frame"].drop(columns=["row_position"])
+
+        insert_position = df.columns.get_loc("type")
 
-    insert_position = df.columns.get_loc("type")
+        df.insert(insert_position, language_key, "")
 
-    df.insert(insert_position, language_key, "")
+        for t in translations:
 
-    for t in translations:
+            row_index = t["row_position"] - 2
+            df.at[row_index, language_key] = t["translation"]
 
-        row_index = t["row_position"] - 2
-        df.at[row_index, language_key] = t["translation"]
+        df.to_excel(DATASET_PATH, index=False)
 
-    df.to_excel(dataset_path, index=False)
+        reload_dataset_store()
 
     existing_language = db.query(Language).filter(
         Language.languageName == languageName
@@ -1805,30 +3362,202 @@ def delete_language(
     
 # TTS Endpoint
 
-@app.get("/api/tutur/speak/{lang}")
-def generate_audio(
-    text: str,
-    lang: str
-):
+TTS_CACHE_CONTROL = "public, max-age=604800"
+STUB_SAMPLE_RATE = 16000
 
-    if lang not in LANGUAGE_MAP:
-        lang = "id"
-
-    language_code = LANGUAGE_MAP.get(lang.lower(), "id")
+def synthesize_gtts(text, voice):
+    from gtts import gTTS
 
     mp3_fp = io.BytesIO()
 
-    tts = gTTS(text, lang=language_code)
+    tts = gTTS(text, lang=voice)
     tts.write_to_fp(mp3_fp)
 
-    mp3_fp.seek(0)
+    return mp3_fp.getvalue()
 
-    return StreamingResponse(
-        mp3_fp,
-        media_type="audio/mpeg"
-    )
+def synthesize_espeak(text, voice):
+
+    try:
+        # teks lewat stdin supaya tidak terbaca sebagai opsi CLI
+        result = subprocess.run(
+            [ESPEAK_PATH, "-v", voice, "--stdout", "--stdin"],
+            input=text.encode("utf-8"),
+            capture_output=True,
+            check=True,
+            timeout=30
+        )
+    except FileNotFoundError:
+        raise HTTPException(status_code=503, detail=f"TTS backend '{ESPEAK_PATH}' not found")
+    except subprocess.CalledProcessError as e:
+        raise HTTPException(status_code=500, detail=e.stderr.decode("utf-8", "replace").strip())
+
+    return result.stdout
+
+def synthesize_stub(text, voice):
+
+    # nada sinus yang sama untuk teks dan suara yang sama, tanpa layanan luar
+    digest = hashlib.sha256(f"{voice}\n{text}".encode("utf-8")).digest()
+
+    frequency = 220 + digest[0] * 2
+    duration = min(5.0, 0.2 + 0.05 * len(text.split()))
+
+    t = np.arange(int(STUB_SAMPLE_RATE * duration)) / STUB_SAMPLE_RATE
+    samples = (np.sin(2 * np.pi * frequency * t) * 0.3 * 32767).astype("<i2")
+
+    wav_fp = io.BytesIO()
+
+    with wave.open(wav_fp, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(STUB_SAMPLE_RATE)
+        wav_file.writeframes(samples.tobytes())
+
+    return wav_fp.getvalue()
+
+TTS_BACKENDS = {
+    "gtts": {"synthesize": synthesize_gtts, "media_type": "audio/mpeg", "extension": "mp3"},
+    "espeak": {"synthesize": synthesize_espeak, "media_type": "audio/wav", "extension": "wav"},
+    "stub": {"synthesize": synthesize_stub, "media_type": "audio/wav", "extension": "wav"},
+}
+
+if TTS_BACKEND not in TTS_BACKENDS:
+    raise ValueError(f"Unknown TTS backend '{TTS_BACKEND}'")
+
+tts_backend = TTS_BACKENDS[TTS_BACKEND]
+tts_voices = LANGUAGE_MAP[TTS_BACKEND]
+
+# satu folder per backend supaya batas ukuran tidak tercampur format audio lain
+tts_disk_dir = os.path.join(TTS_CACHE_DIR, TTS_BACKEND) if TTS_CACHE_DIR else ""
+
+tts_cache = LRUCache(TTS_CACHE_SIZE)
+tts_disk_lock = threading.Lock()
+tts_disk_index = OrderedDict()
+tts_disk_stats = {"bytes": 0, "hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+def tts_cache_key(text, voice):
+    normalized = " ".join(text.lower().split())
+    return hashlib.sha256(f"{TTS_BACKEND}\n{voice}\n{normalized}".encode("utf-8")).hexdigest()
+
+def tts_disk_path(cache_key):
+    return os.path.join(tts_disk_dir, cache_key[:2], f"{cache_key}.{tts_backend['extension']}")
+
+def load_tts_disk_index():
+
+    entries = []
+
+    extension = f".{tts_backend['extension']}"
+
+    for root, _, files in os.walk(tts_disk_dir):
+        for filename in files:
+            if filename.endswith(extension):
+                stat = os.stat(os.path.join(root, filename))
+                entries.append((stat.st_mtime, filename[:-len(extension)], stat.st_size))
+
+    # yang paling lama tidak dipakai ada di depan
+    for _, cache_key, size in sorted(entries):
+        tts_disk_index[cache_key] = size
+        tts_disk_stats["bytes"] += size
+
+def evict_tts_disk(max_bytes):
 
+    while tts_disk_index and tts_disk_stats["bytes"] > max_bytes:
+        cache_key, size = tts_disk_index.popitem(last=False)
+        tts_disk_stats["bytes"] -= size
+        tts_disk_stats["evictions"] += 1
 
+        try:
+            os.remove(tts_disk_path(cache_key))
+        except FileNotFoundError:
+            pass
 
+def get_cached_audio(cache_key):
 
+    audio = tts_cache.get(cache_key)
 
+    if audio is not None or not tts_disk_dir:
+        return audio
+
+    with tts_disk_lock:
+
+        if cache_key not in tts_disk_index:
+            tts_disk_stats["misses"] += 1
+            return None
+
+        path = tts_disk_path(cache_key)
+
+        try:
+            with open(path, "rb") as f:
+                audio = f.read()
+        except FileNotFoundError:
+            tts_disk_stats["bytes"] -= tts_disk_index.pop(cache_key)
+            tts_disk_stats["misses"] += 1
+            return None
+
+        # mtime dipakai sebagai urutan LRU saat server dinyalakan ulang
+        os.utime(path)
+        tts_disk_index.move_to_end(cache_key)
+        tts_disk_stats["hits"] += 1
+
+    tts_cache.set(cache_key, audio)
+
+    return audio
+
+def set_cached_audio(cache_key, audio):
+
+    tts_cache.set(cache_key, audio)
+
+    if not tts_disk_dir:
+        return
+
+    path = tts_disk_path(cache_key)
+    temp_path = f"{path}.{threading.get_ident()}.tmp"
+
+    with tts_disk_lock:
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(temp_path, "wb") as f:
+            f.write(audio)
+
+        os.replace(temp_path, path)
+
+        tts_disk_stats["bytes"] += len(audio) - tts_disk_index.pop(cache_key, 0)
+        tts_disk_index[cache_key] = len(audio)
+        tts_disk_stats["writes"] += 1
+
+        evict_tts_disk(TTS_CACHE_MAX_MB * 1024 * 1024)
+
+if tts_disk_dir:
+    load_tts_disk_index()
+
+@app.get("/api/tutur/speak/{lang}")
+def generate_audio(
+    text: str,
+    lang: str,
+    request: Request
+):
+
+    voice = tts_voices.get(lang.lower(), tts_voices["indonesia"])
+
+    cache_key = tts_cache_key(text, voice)
+
+    headers = {
+        "ETag": f'"{cache_key[:32]}"',
+        "Cache-Control": TTS_CACHE_CONTROL
+    }
+
+    # ETag hanya bergantung pada backend, teks dan bahasa, jadi 304 tidak perlu audio
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    audio = get_cached_audio(cache_key)
+
+    if audio is None:
+        audio = tts_backend["synthesize"](" ".join(text.split()), voice)
+        set_cached_audio(cache_key, audio)
+
+    return Response(
+        content=audio,
+        media_type=tts_backend["media_type"],
+        headers=headers
+    )
@@ -0,0 +1,161 @@
+import os
+import sys
+import math
+import time
+import argparse
+import resource
+import statistics
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import apiGateway
+from transformers import T5Tokenizer
+
+
+def current_rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def load_samples(target_lang, count):
+    columns = apiGateway.dataset_store["columns"]
+
+    if target_lang not in columns:
+        raise SystemExit(f"Column '{target_lang}' not found in dataset")
+
+    pairs = [
+        (source, reference)
+        for source, reference in zip(columns["english"], columns[target_lang])
+        if source and reference
+    ]
+
+    step = max(1, len(pairs) // count)
+    return pairs[::step][:count]
+
+
+def normalize(text):
+    return apiGateway.normalize_lookup_text(text)
+
+
+def corpus_bleu(hypotheses, references, max_order=4):
+    matches = [0] * max_order
+    totals = [0] * max_order
+    hyp_length = 0
+    ref_length = 0
+
+    for hypothesis, reference in zip(hypotheses, references):
+        hyp_tokens = normalize(hypothesis).split()
+        ref_tokens = normalize(reference).split()
+
+        hyp_length += len(hyp_tokens)
+        ref_length += len(ref_tokens)
+
+        for n in range(1, max_order + 1):
+            hyp_ngrams = Counter(tuple(hyp_tokens[i:i + n]) for i in range(len(hyp_tokens) - n + 1))
+            ref_ngrams = Counter(tuple(ref_tokens[i:i + n]) for i in range(len(ref_tokens) - n + 1))
+
+            matches[n - 1] += sum((hyp_ngrams & ref_ngrams).values())
+            totals[n - 1] += max(0, len(hyp_tokens) - n + 1)
+
+    if hyp_length == 0:
+        return 0.0
+
+    # smoothing +1 supaya n-gram kosong tidak membuat skor jadi nol
+    log_precision = sum(
+        math.log((matches[i] + 1) / (totals[i] + 1)) for i in range(max_order)
+    ) / max_order
+
+    brevity = 1.0 if hyp_length > ref_length else math.exp(1 - ref_length / hyp_length)
+
+    return 100 * brevity * math.exp(log_precision)
+
+
+def benchmark_backend(name, tokenizer, samples, target_lang, batch_size, profile):
+    rss_before = current_rss_mb()
+
+    started = time.perf_counter()
+    model, device = apiGateway.TRANSLATOR_BACKENDS[name]()
+    load_seconds = time.perf_counter() - started
+
+    rss_after = current_rss_mb()
+
+    input_texts = [f"translate english to {target_lang}: {source}" for source, _ in samples]
+
+    # pemanasan
+    apiGateway.generate_translations(tokenizer, model, device, input_texts[:1], profile)
+
+    latencies = []
+    for input_text in input_texts:
+        started = time.perf_counter()
+        apiGateway.generate_translations(tokenizer, model, device, [input_text], profile)
+        latencies.append(time.perf_counter() - started)
+
+    hypotheses = []
+    started = time.perf_counter()
+    for i in range(0, len(input_texts), batch_size):
+        hypotheses.extend(
+            apiGateway.generate_translations(
+                tokenizer, model, device, input_texts[i:i + batch_size], profile
+            )
+        )
+    batch_seconds = time.perf_counter() - started
+
+    references = [reference for _, reference in samples]
+    exact = sum(
+        1 for hypothesis, reference in zip(hypotheses, references)
+        if normalize(hypothesis) == normalize(reference)
+    )
+
+    latencies.sort()
+
+    print(f"=== {name} ===")
+    print(f"Load time          : {load_seconds:.2f} s")
+    print(f"Memory (RSS delta) : {rss_after - rss_before:.1f} MB")
+    print(f"Latency p50        : {statistics.median(latencies) * 1000:.1f} ms")
+    print(f"Latency p95        : {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f} ms")
+    print(f"Throughput (b={batch_size:<3}) : {len(input_texts) / batch_seconds:.2f} texts/s")
+    print(f"Exact match        : {exact / len(samples) * 100:.2f} %")
+    print(f"BLEU               : {corpus_bleu(hypotheses, references):.2f}")
+    print()
+
+    del model
+
+    return hypotheses
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backends", nargs="+", default=list(apiGateway.TRANSLATOR_BACKENDS))
+    parser.add_argument("--target", default="indonesian")
+    parser.add_argument("--samples", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--profile", default="beam4", choices=list(apiGateway.DECODING_PROFILES))
+    args = parser.parse_args()
+
+    tokenizer = T5Tokenizer.from_pretrained(apiGateway.MODEL_PATH)
+    samples = load_samples(args.target, args.samples)
+
+    print(f"Samples : {len(samples)} (english -> {args.target})")
+    print(f"Profile : {args.profile}")
+    print()
+
+    baseline = None
+
+    for name in args.backends:
+        hypotheses = benchmark_backend(
+            name, tokenizer, samples, args.target, args.batch_size, args.profile
+        )
+
+        if baseline is None:
+            baseline = (name, hypotheses)
+            continue
+
+        agreement = sum(1 for a, b in zip(baseline[1], hypotheses) if a == b)
+        print(f"Agreement with {baseline[0]} : {agreement / len(samples) * 100:.2f} %")
+        print()
@@ -0,0 +1,87 @@
+import os
+import sys
+import time
+import random
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import apiGateway
+
+
+def legacy_options(option_pool, correct_answer):
+    # cara lama: saring dan acak seluruh pool untuk setiap soal
+    distractors = [w for w in option_pool if w != correct_answer]
+    random.shuffle(distractors)
+
+    options = distractors[:4] + [correct_answer]
+    options = list(set(options))
+    random.shuffle(options)
+
+    return options
+
+
+def sampler_options(pool, correct_answer, rng):
+    return apiGateway.build_options(pool, correct_answer, rng)
+
+
+def time_it(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1_000_000
+
+
+def benchmark_pool_sizes(values, sizes, repeat):
+    rng = np.random.default_rng(0)
+
+    print("=== Options per question (us) ===")
+    print(f"{'pool':>8} {'legacy':>10} {'sampler':>10} {'speedup':>8}")
+
+    for size in sizes:
+        option_pool = [values[i % len(values)] + str(i // len(values)) for i in range(size)]
+        pool = apiGateway.build_option_pool(option_pool)
+        correct_answer = option_pool[size // 2]
+
+        legacy = time_it(lambda: legacy_options(option_pool, correct_answer), repeat)
+        sampler = time_it(lambda: sampler_options(pool, correct_answer, rng), repeat)
+
+        print(f"{size:>8} {legacy:>10.2f} {sampler:>10.2f} {legacy / sampler:>7.1f}x")
+
+    print()
+
+
+def benchmark_course(dominant, local, repeat):
+    bank = apiGateway.get_course_bank(dominant, local)
+    entries = [
+        bank["steps"][step] for step in bank["order"]
+        if bank["steps"][step]["type"] == "word" or bank["steps"][step]["words"] is not None
+    ]
+
+    def generate_course():
+        for entry in entries:
+            apiGateway.generate_step_questions(entry, dominant, local)
+
+    print("=== Full course generation ===")
+    print(f"Steps           : {len(entries)}")
+    print(f"Time per course : {time_it(generate_course, repeat) / 1000:.2f} ms")
+
+    first = apiGateway.generate_step_questions(entries[0], dominant, local, seed=42)
+    second = apiGateway.generate_step_questions(entries[0], dominant, local, seed=42)
+    print(f"Seed reproducible : {first == second}")
+    print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dominant", default="indonesian")
+    parser.add_argument("--local", default="java")
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    values = [value for value in apiGateway.dataset_store["columns"][args.local] if value]
+
+    benchmark_pool_sizes(values, [10, 100, 1000, 10000], args.repeat)
+    benchmark_course(args.dominant, args.local, max(1, args.repeat // 100))
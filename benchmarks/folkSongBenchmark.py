@@ -0,0 +1,112 @@
+import os
+import re
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import apiGateway
+
+
+def legacy_test(song_data, rng):
+    # cara lama: tokenisasi ulang setiap lirik dan pilih pengecoh dengan rejection sampling
+    timestamps = song_data.get("timestamp", [])
+
+    word_pool = []
+    for item in timestamps:
+        word_pool.extend(re.findall(r'\b\w+\b', item["text"]))
+
+    word_pool = sorted(set(word_pool))
+
+    questions = []
+
+    for item in timestamps:
+
+        words = re.findall(r'\b\w+\b', item["text"])
+
+        if len(words) < 2:
+            continue
+
+        remove_count = rng.randint(1, min(3, len(words)))
+        remove_indexes = sorted(rng.sample(range(len(words)), remove_count))
+
+        removed_words = [words[i] for i in remove_indexes]
+
+        blank_words = words.copy()
+        for i in remove_indexes:
+            blank_words[i] = "____"
+
+        options = removed_words.copy()
+        distractor_pool = [w for w in word_pool if w not in removed_words]
+
+        # dibatasi supaya benchmark tidak macet pada pool yang terlalu kecil
+        attempts = 0
+        while len(options) < 5 and distractor_pool and attempts < 1000:
+            attempts += 1
+            random_word = rng.choice(distractor_pool)
+            if random_word not in options:
+                options.append(random_word)
+
+        rng.shuffle(options)
+
+        questions.append({"question": " ".join(blank_words), "answer": removed_words, "option": options})
+
+    return questions
+
+
+def indexed_test(lyrics, rng):
+    questions = []
+
+    for line in lyrics["lines"]:
+        question = apiGateway.build_lyric_question(line, lyrics["vocabulary"], rng)
+        if question is not None:
+            questions.append(question)
+
+    return questions
+
+
+def time_it(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    catalog = apiGateway.get_folk_song_catalog()
+    build_ms = (time.perf_counter() - started) * 1000
+
+    songs = list(catalog["keys"].values())
+    rng = random.Random(0)
+
+    def legacy_catalog():
+        for song in songs:
+            legacy_test(song["data"], rng)
+
+    def indexed_catalog():
+        for song in songs:
+            indexed_test(song["lyrics"], rng)
+
+    legacy = time_it(legacy_catalog, args.repeat)
+    indexed = time_it(indexed_catalog, args.repeat)
+
+    print("=== Folk song test generation (whole catalog) ===")
+    print(f"Songs            : {len(songs)}")
+    print(f"Lyric lines      : {sum(len(song['lyrics']['lines']) for song in songs)}")
+    print(f"Catalog build    : {build_ms:.2f} ms")
+    print(f"Legacy per pass  : {legacy:.3f} ms")
+    print(f"Indexed per pass : {indexed:.3f} ms")
+    print(f"Speedup          : {legacy / indexed:.1f}x")
+
+    # pool dengan dua kata saja: versi lama bisa berputar tanpa henti di sini
+    small = apiGateway.build_lyric_index({"timestamp": [{"start": "00:00", "end": "00:01", "text": "la la la lu"}]})
+    question = apiGateway.build_lyric_question(small["lines"][0], small["vocabulary"], rng)
+    print(f"Small pool options : {question['option']}")
@@ -0,0 +1,87 @@
+import os
+import sys
+import time
+import argparse
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import apiGateway
+
+
+def load_texts(count):
+    english = apiGateway.dataset_store["columns"]["english"]
+    texts = [text for text in english if text][:count]
+
+    return texts
+
+
+def per_request(text, target_lang):
+    input_text = f"translate english to {target_lang}: {text}"
+    results, _ = apiGateway.model_translate_batch([input_text], PROFILE)
+    return results[0]
+
+
+def batched(text, target_lang):
+    # lewati cache supaya setiap request benar-benar masuk ke model
+    input_text = f"translate english to {target_lang}: {text}"
+    result, _ = apiGateway.translation_batcher.submit(input_text, PROFILE).result()
+    return result
+
+
+def run(name, translate_fn, texts, target_lang, concurrency):
+    latencies = []
+
+    def timed(text):
+        started = time.perf_counter()
+        translate_fn(text, target_lang)
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(timed, texts))
+
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+
+    print(f"=== {name} ===")
+    print(f"Requests       : {len(texts)}")
+    print(f"Concurrency    : {concurrency}")
+    print(f"Throughput     : {len(texts) / elapsed:.2f} req/s")
+    print(f"Latency p50    : {statistics.median(latencies) * 1000:.1f} ms")
+    print(f"Latency p95    : {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f} ms")
+    print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--target", default="indonesian")
+    parser.add_argument("--profile", default=apiGateway.TRANSLATE_DECODING_PROFILE)
+    args = parser.parse_args()
+
+    PROFILE = args.profile
+
+    apiGateway.load_translator()
+
+    if apiGateway.translator_state["status"] != "ready":
+        raise SystemExit(f"Translator failed to load: {apiGateway.translator_state['error']}")
+
+    texts = load_texts(args.requests)
+
+    # pemanasan supaya waktu load pertama tidak ikut terukur
+    per_request(texts[0], args.target)
+    batched(texts[0], args.target)
+
+    print("Device         :", apiGateway.translator_state["device"])
+    print(f"Batch window   : {apiGateway.TRANSLATE_BATCH_WINDOW_MS} ms")
+    print(f"Max batch      : {apiGateway.TRANSLATE_MAX_BATCH}")
+    print(f"Profile        : {PROFILE}")
+    print()
+
+    run("per-request generate", per_request, texts, args.target, args.concurrency)
+    run("micro-batched generate", batched, texts, args.target, args.concurrency)
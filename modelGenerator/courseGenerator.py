@@ -1,98 +1,307 @@
 import os
 import json
 import random
+import hashlib
+import argparse
 import pandas as pd
 
 DATASET_PATH = os.path.join("datasets", "DatasetLanguage.xlsx")
 OUTPUT_PATH = os.path.join("courses", "courses.json")
+MANIFEST_PATH = os.path.join("courses", "courses.manifest.json")
+PAIRS_PATH = os.path.join("courses", "pairs")
+COVERAGE_PATH = os.path.join("courses", "coverage.json")
 
-df = pd.read_excel(DATASET_PATH)
-df["indonesian"] = df["indonesian"].astype(str).str.lower()
-df["type"] = df["type"].astype(str).str.lower()
-df["category_topic"] = df["category_topic"].astype(str)
+# dinaikkan jika cara menyusun step berubah, supaya manifest lama tidak dipakai
+PLAN_VERSION = 2
 
-df["row_position"] = df.index + 2
+# jumlah baris minimum supaya soal bisa punya 4 pengecoh + 1 jawaban
+MIN_STEP_ROWS = {
+    "listWords": 5,
+    "listPhrases": 5,
+    "listSentences": 3
+}
 
-topics = df["category_topic"].unique()
+# di bawah ini soal tidak punya pengecoh sama sekali, jadi grup step dibuang
+MIN_USABLE_ROWS = 2
 
-result = {}
-global_step = 1
 
-for topic in topics:
+def load_dataset(dataset_path):
+    df = pd.read_excel(dataset_path, keep_default_na=False)
 
-    topic_df = df[df["category_topic"] == topic]
-    topic_data = []
+    language_columns = list(df.columns[:df.columns.get_loc("type")])
+
+    for col in language_columns:
+        df[col] = df[col].fillna("").astype(str).str.strip().str.lower()
+
+    df["type"] = df["type"].fillna("").astype(str).str.lower()
+    df["category_topic"] = df["category_topic"].astype(str)
+
+    df["row_position"] = df.index + 2
+
+    return df, language_columns
+
+
+def build_topic_index(df, text_col):
+    # tokenisasi sekali untuk seluruh dataset, lalu kelompokkan per topik
+    topics = {}
+
+    for topic in df["category_topic"].unique():
+        topics[topic] = {
+            "rows": [],
+            "sentences": [],
+            "phrase_rows": [],
+            "word_rows": [],
+            "phrase_index": {},
+            "word_index": {}
+        }
+
+    for row_position, text, row_type, topic, row_key in zip(
+        df["row_position"], df[text_col], df["type"], df["category_topic"], df["row_key"]
+    ):
+        data = topics[topic]
+
+        row_position = int(row_position)
+        data["rows"].append((row_position, row_key, row_type))
+
+        if row_type == "sentence":
+            data["sentences"].append((row_position, set(text.split())))
+
+        elif row_type == "phrase":
+            data["phrase_rows"].append(row_position)
+
+            for token in set(text.split()):
+                data["phrase_index"].setdefault(token, []).append(row_position)
+
+        elif row_type == "word":
+            data["word_rows"].append(row_position)
+            data["word_index"].setdefault(text, []).append(row_position)
+
+    return topics
+
+
+def topic_fingerprint(data, seed):
+    digest = hashlib.sha256(str(seed).encode())
+
+    for row_position, row_key, row_type in data["rows"]:
+        digest.update(f"{row_position}\t{row_key}\t{row_type}\n".encode("utf-8"))
+
+    return digest.hexdigest()
+
+
+def top_up_rows(selected, topic_rows, target, rng):
+
+    # lengkapi step yang kurang dengan baris lain dari topik yang sama
+    if len(selected) >= target:
+        return selected
+
+    chosen = set(selected)
+    extra = [row for row in topic_rows if row not in chosen]
+
+    return selected + rng.sample(extra, min(target - len(selected), len(extra)))
+
+
+def generate_topic_steps(topic, data, seed, rng_key):
+    rng = random.Random(f"{seed}:{rng_key}{topic}")
+    steps = []
 
     for group in range(2):
 
-        sentence_df = topic_df[topic_df["type"] == "sentence"]
+        if len(data["sentences"]) == 0:
+            continue
+
+        selected_sentences = rng.sample(data["sentences"], min(3, len(data["sentences"])))
 
-        if len(sentence_df) == 0:
+        sentence_rows = [row_position for row_position, _ in selected_sentences]
+        sentence_words = set().union(*(words for _, words in selected_sentences))
+
+        valid_phrases = sorted({
+            row_position
+            for word in sentence_words
+            for row_position in data["phrase_index"].get(word, [])
+        })
+
+        valid_words = sorted({
+            row_position
+            for word in sentence_words
+            for row_position in data["word_index"].get(word, [])
+        })
+
+        phrase_rows = rng.sample(valid_phrases, min(5, len(valid_phrases)))
+        word_rows = rng.sample(valid_words, min(10, len(valid_words)))
+
+        phrase_rows = top_up_rows(phrase_rows, data["phrase_rows"], MIN_STEP_ROWS["listPhrases"], rng)
+        word_rows = top_up_rows(word_rows, data["word_rows"], MIN_STEP_ROWS["listWords"], rng)
+
+        # step frasa dan kalimat bergantung pada step kata sebelumnya, jadi satu grup dibuang bersama
+        if min(len(word_rows), len(phrase_rows), len(sentence_rows)) < MIN_USABLE_ROWS:
             continue
 
-        selected_sentences = sentence_df.sample(
-            min(3, len(sentence_df))
-        )
+        steps.append({"type": "word", "listWords": word_rows})
+        steps.append({"type": "phrase", "listPhrases": phrase_rows})
+        steps.append({"type": "sentence", "listSentences": sentence_rows})
 
-        sentence_rows = selected_sentences["row_position"].tolist()
-        sentence_text = " ".join(selected_sentences["indonesian"])
-        sentence_words = set(sentence_text.split())
+    return steps
 
-        phrase_df = topic_df[topic_df["type"] == "phrase"]
 
-        valid_phrases = phrase_df[
-            phrase_df["indonesian"].apply(
-                lambda x: len(set(x.split()) & sentence_words) >= 1
-            )
-        ]
+def load_manifest(manifest_path, seed):
+    if not os.path.exists(manifest_path):
+        return {}
 
-        selected_phrases = valid_phrases.sample(
-            min(5, len(valid_phrases))
-        )
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
 
-        phrase_rows = selected_phrases["row_position"].tolist()
+    if manifest.get("seed") != seed or manifest.get("version") != PLAN_VERSION:
+        return {}
 
-        word_df = topic_df[topic_df["type"] == "word"]
+    return manifest.get("topics", {})
 
-        valid_words = word_df[
-            word_df["indonesian"].apply(
-                lambda x: x in sentence_words
+
+def build_plan(df, text_col, output_path, manifest_path, seed, full_rebuild=False, rng_key=""):
+    topics = build_topic_index(df, text_col)
+
+    previous = {} if full_rebuild else load_manifest(manifest_path, seed)
+
+    manifest_topics = {}
+    rebuilt = []
+    reused = []
+
+    for topic, data in topics.items():
+        fingerprint = topic_fingerprint(data, seed)
+        cached = previous.get(topic)
+
+        if cached and cached["fingerprint"] == fingerprint:
+            steps = cached["steps"]
+            reused.append(topic)
+        else:
+            steps = generate_topic_steps(topic, data, seed, rng_key)
+            rebuilt.append(topic)
+
+        manifest_topics[topic] = {"fingerprint": fingerprint, "steps": steps}
+
+    # nomor step global disusun ulang karena jumlah step per topik bisa berubah
+    result = {}
+    global_step = 1
+
+    for topic, entry in manifest_topics.items():
+        topic_data = []
+
+        for item in entry["steps"]:
+            topic_data.append({"step": global_step, **item})
+            global_step += 1
+
+        result[topic] = topic_data
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=4, ensure_ascii=False)
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({"seed": seed, "version": PLAN_VERSION, "topics": manifest_topics}, f, indent=4, ensure_ascii=False)
+
+    return result, rebuilt, reused
+
+
+def plan_coverage(plan):
+    issues = []
+
+    for topic, items in plan.items():
+        if not items:
+            issues.append({"topic": topic, "step": None, "issue": "no steps"})
+
+        for item in items:
+            for list_key, minimum in MIN_STEP_ROWS.items():
+                if list_key not in item:
+                    continue
+
+                total = len(item[list_key])
+
+                if total == 0:
+                    issues.append({"topic": topic, "step": item["step"], "list": list_key, "rows": 0, "issue": "empty"})
+                elif total < minimum:
+                    issues.append({"topic": topic, "step": item["step"], "list": list_key, "rows": total, "issue": "short"})
+
+    return issues
+
+
+def build_pair_plans(df, language_columns, pairs_path, seed, full_rebuild=False):
+    coverage = {}
+
+    for dominant in language_columns:
+        for local in language_columns:
+            if dominant == local:
+                continue
+
+            # hanya baris yang terisi di kedua kolom yang boleh masuk kursus
+            mask = (df[dominant] != "") & (df[local] != "")
+            pair_df = df[mask].copy()
+            pair_df["row_key"] = pair_df[dominant] + "\t" + pair_df[local]
+
+            pair_name = f"{dominant}__{local}"
+
+            plan, rebuilt, _ = build_plan(
+                pair_df,
+                dominant,
+                os.path.join(pairs_path, f"{pair_name}.json"),
+                os.path.join(pairs_path, f"{pair_name}.manifest.json"),
+                seed,
+                full_rebuild,
+                rng_key=f"{dominant}:{local}:"
             )
-        ]
 
-        selected_words = valid_words.sample(
-            min(10, len(valid_words))
-        )
+            issues = plan_coverage(plan)
+            coverage[pair_name] = {
+                "rows": int(mask.sum()),
+                "steps": sum(len(items) for items in plan.values()),
+                "issues": issues
+            }
 
-        word_rows = selected_words["row_position"].tolist()
+            print(f"{pair_name:<40} rebuilt {len(rebuilt):>2} topics, {len(issues):>3} coverage issues")
 
-        topic_data.append({
-            "step": global_step,
-            "type": "word",
-            "listWords": word_rows
-        })
-        global_step += 1
+    return coverage
 
-        topic_data.append({
-            "step": global_step,
-            "type": "phrase",
-            "listPhrases": phrase_rows
-        })
 
-        global_step += 1
+def build_courses(dataset_path, output_path, manifest_path, seed, full_rebuild=False, pairs_path=None, coverage_path=None):
+    df, language_columns = load_dataset(dataset_path)
+    df["row_key"] = df["indonesian"]
+
+    _, rebuilt, reused = build_plan(df, "indonesian", output_path, manifest_path, seed, full_rebuild)
+
+    if pairs_path:
+        coverage = build_pair_plans(df, language_columns, pairs_path, seed, full_rebuild)
+
+        with open(coverage_path, "w", encoding="utf-8") as f:
+            json.dump(coverage, f, indent=4, ensure_ascii=False)
+
+    return rebuilt, reused
 
-        topic_data.append({
-            "step": global_step,
-            "type": "sentence",
-            "listSentences": sentence_rows
-        })
-        global_step += 1
 
-    result[topic] = topic_data
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--full", action="store_true", help="ignore the manifest and rebuild every topic")
+    parser.add_argument("--no-pairs", action="store_true", help="only build the default courses.json")
+    parser.add_argument("--dataset", default=DATASET_PATH)
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    parser.add_argument("--manifest", default=MANIFEST_PATH)
+    parser.add_argument("--pairs-output", default=PAIRS_PATH)
+    parser.add_argument("--coverage", default=COVERAGE_PATH)
+    args = parser.parse_args()
 
-os.makedirs("courses", exist_ok=True)
+    rebuilt, reused = build_courses(
+        args.dataset,
+        args.output,
+        args.manifest,
+        args.seed,
+        args.full,
+        None if args.no_pairs else args.pairs_output,
+        args.coverage
+    )
 
-with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
-    json.dump(result, f, indent=4, ensure_ascii=False)
+    print("Topics rebuilt  :", len(rebuilt), rebuilt)
+    print("Topics reused   :", len(reused))
+    print("Output file saved at :", args.output)
 
-print("Output file saved at :", OUTPUT_PATH)
\ No newline at end of file
+    if not args.no_pairs:
+        print("Pair plans saved at  :", args.pairs_output)
+        print("Coverage report      :", args.coverage)
@@ -0,0 +1,25 @@
+import os
+import argparse
+from transformers import T5Tokenizer
+from optimum.onnxruntime import ORTModelForSeq2SeqLM
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--model", default="./translator_model_lite")
+parser.add_argument("--output", default="./translator_model_onnx")
+args = parser.parse_args()
+
+if not os.path.exists(args.model):
+    raise FileNotFoundError(f"Model folder '{args.model}' not found")
+
+print("Exporting model from :", args.model)
+
+# export encoder, decoder dan decoder-with-past ke ONNX
+model = ORTModelForSeq2SeqLM.from_pretrained(args.model, export=True)
+tokenizer = T5Tokenizer.from_pretrained(args.model)
+
+os.makedirs(args.output, exist_ok=True)
+
+model.save_pretrained(args.output)
+tokenizer.save_pretrained(args.output)
+
+print("ONNX model saved at :", args.output)